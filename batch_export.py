@@ -0,0 +1,135 @@
+# batch_export.py
+# 批量导出：给很多家庭一次性画 日菜单卡片 (PNG) / 周海报 (PNG) / 可打印周海报 (PDF)
+# 进程池渲染 (每个 worker 启动时预加载字体)，边画边写到目录或 zip，内存里最多只有 窗口大小 张图
+#
+#   python batch_export.py --users all --format pdf --out posters.zip
+#   python batch_export.py --jobs jobs.jsonl --format card --out cards/ --workers 4
+#
+# jobs.jsonl 每行一个任务：{"id", "nickname", "menu": {格子: 菜名}} 或 {"id", "nickname", "days": [{"date", "menu"}]}
+import argparse
+import io
+import json
+import os
+import sys
+import time
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+FORMATS = ("card", "poster", "pdf")
+WINDOW_PER_WORKER = 2   # 每个 worker 最多排队这么多任务，结果不会在内存里堆积
+PDF_RESOLUTION = 150
+
+
+def _init_worker():
+    """worker 启动时把要用的字号都加载一遍，之后每张图直接复用"""
+    from fonts import get_pil_font
+    from menu_card import CARD_FONT_SIZES, POSTER_FONT_SIZES
+    for size in CARD_FONT_SIZES + POSTER_FONT_SIZES: get_pil_font(size)
+
+def _encode(img, fmt):
+    buf = io.BytesIO()
+    if fmt == "pdf": img.save(buf, format="PDF", resolution=PDF_RESOLUTION)
+    else: img.save(buf, format="PNG")
+    return buf.getvalue()
+
+def render_job(job, fmt):
+    """一个任务 -> [(文件名, 字节)]；card 每天一张，poster / pdf 每个任务一张"""
+    from menu_card import CARD_SLOTS, create_menu_card_image, create_week_poster_image
+    days = job.get("days") or [{"date": job.get("date", "today"), "menu": job["menu"]}]
+    nickname = job.get("nickname") or job["id"]
+    if fmt != "card":
+        ext = "pdf" if fmt == "pdf" else "png"
+        return [(f"{job['id']}_week.{ext}", _encode(create_week_poster_image(days, nickname), fmt))]
+    out = []
+    for day in days:
+        m = day["menu"]
+        menu = {k: {"name": m.get(k) or ""} for k in CARD_SLOTS}
+        menu["fruit"] = m.get("fruit") or ""
+        out.append((f"{job['id']}_{day['date']}.png", _encode(create_menu_card_image(menu, nickname), "png")))
+    return out
+
+
+class _DirSink:
+    def __init__(self, path): self.path = path; os.makedirs(path, exist_ok=True)
+    def write(self, name, data):
+        with open(os.path.join(self.path, name), "wb") as f: f.write(data)
+    def close(self): pass
+
+class _ZipSink:
+    """PNG / PDF 本身已压缩，zip 里直接存 (ZIP_STORED)"""
+    def __init__(self, path): self.zip = zipfile.ZipFile(path, "w", zipfile.ZIP_STORED)
+    def write(self, name, data): self.zip.writestr(name, data)
+    def close(self): self.zip.close()
+
+
+def export(jobs, out, fmt="poster", workers=None, progress=None):
+    """jobs 可以是生成器 (边生成边提交)；out 以 .zip 结尾时写 zip，否则写目录。返回统计 dict"""
+    if fmt not in FORMATS: raise ValueError(f"未知格式 {fmt!r}，可选 {FORMATS}")
+    sink = _ZipSink(out) if out.endswith(".zip") else _DirSink(out)
+    workers = workers or os.cpu_count() or 1
+    stats = {"jobs": 0, "images": 0, "bytes": 0, "workers": workers}
+    start = time.perf_counter()
+    def collect(done):
+        for fut in done:
+            for name, data in fut.result():
+                sink.write(name, data); stats["images"] += 1; stats["bytes"] += len(data)
+            stats["jobs"] += 1
+            if progress: progress(stats)
+    try:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+            pending, window = set(), workers * WINDOW_PER_WORKER
+            for job in jobs:
+                pending.add(pool.submit(render_job, job, fmt))
+                if len(pending) >= window:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED); collect(done)
+            collect(wait(pending)[0])
+    finally: sink.close()
+    stats["seconds"] = time.perf_counter() - start
+    stats["images_per_sec"] = stats["images"] / stats["seconds"] if stats["seconds"] else 0.0
+    return stats
+
+
+def read_jobs(path):
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if line.strip(): yield json.loads(line)
+
+def plan_jobs(user_ids, store, days=7, seed=None):
+    """按档案给每个用户出菜单 (days=1 时一天，否则一周)，逐个生成任务"""
+    from kitchen_engine import MenuSession, default_profile, menu_names
+    from menu_engine import default_index
+    index = default_index()
+    for uid in user_ids:
+        profile = default_profile(); profile.update(store.load(uid) or {})
+        session = MenuSession(profile, index=index, user_id=uid)
+        if days == 1: yield {"id": uid, "nickname": profile["nickname"], "menu": menu_names(session.generate(seed=seed))}
+        else:
+            plan = session.plan_week(days, seed=seed)
+            yield {"id": uid, "nickname": profile["nickname"], "days": [{"date": d["date"], "menu": menu_names(d["menu"])} for d in plan["days"]]}
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="批量导出菜单卡片 / 周海报")
+    src = ap.add_mutually_exclusive_group(required=True)
+    src.add_argument("--jobs", help="任务 JSONL 文件")
+    src.add_argument("--users", nargs="+", help="用户 id 列表，all 表示档案库里的全部用户")
+    ap.add_argument("--days", type=int, default=7, help="--users 时每人出几天的菜单")
+    ap.add_argument("--seed", type=int)
+    ap.add_argument("--format", choices=FORMATS, default="poster")
+    ap.add_argument("--out", required=True, help="输出目录，或 .zip 文件")
+    ap.add_argument("--workers", type=int, help="进程数 (默认 CPU 核数)")
+    args = ap.parse_args(argv)
+    if args.jobs: jobs = read_jobs(args.jobs)
+    else:
+        from profile_store import open_profile_store
+        store = open_profile_store(delay=0)
+        users = store.users() if args.users == ["all"] else args.users
+        jobs = plan_jobs(users, store, args.days, args.seed)
+    from fonts import font_status
+    if font_status(): print(f"警告：{font_status()}", file=sys.stderr)
+    stats = export(jobs, args.out, args.format, args.workers)
+    print(f"{stats['jobs']} 个任务, {stats['images']} 张, {stats['bytes'] / 1024 / 1024:.1f} MB, "
+          f"{stats['seconds']:.1f} s, {stats['images_per_sec']:.1f} 张/s -> {args.out}")
+    return stats
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,201 @@
+# benchmarks/bench_menu.py
+# 选菜 / 换菜 / 缺货清单 / 菜单卡片的基准测试 (独立脚本，不需要 Streamlit 和 pytest)
+#
+#   python benchmarks/bench_menu.py                      # 1x / 10x / 100x / 1000x 全量
+#   python benchmarks/bench_menu.py --scales 1 10 --quick
+#   python benchmarks/bench_menu.py --compare benchmarks/results/old.json
+#
+# 菜谱库按 RECIPES_DB 放大：每道菜复制 scale 份，并混入合成食材让词表随规模增长 (√scale)
+# 每个用例报告 ops/sec、单次平均耗时和 tracemalloc 峰值内存，结果写成 JSON 方便版本间对比
+import argparse
+import datetime
+import gc
+import itertools
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.environ.setdefault("YOUYOU_FONT_DOWNLOAD", "0")   # 基准测试不联网
+
+from kitchen_engine import MENU_SLOTS, MenuSession, default_profile
+from menu_card import create_menu_card_image
+from menu_engine import RecipeIndex
+from recipe_data import RECIPES_DB, Dish
+import vector_scoring
+
+DEFAULT_SCALES = (1, 10, 100, 1000)
+RESULT_DIR = os.path.join(ROOT, "benchmarks", "results")
+MIN_TIME = 0.5       # 每个用例至少跑这么多秒
+QUICK_MIN_TIME = 0.1
+MEM_OPS = 20         # 测峰值内存时跑的次数 (tracemalloc 很慢，单独跑)
+BATCH_PROFILES = 1000  # 批量打分用例的档案数
+MEM_SESSIONS = 200   # 测每会话常驻内存时开的会话数
+
+
+def synthetic_db(scale, seed=0):
+    """RECIPES_DB 放大 scale 倍；scale=1 时就是原始数据"""
+    if scale == 1: return RECIPES_DB
+    rng = random.Random(seed)
+    extra = [f"合成食材{i}" for i in range(int(40 * scale ** 0.5))]
+    db = {}
+    for pool, dishes in RECIPES_DB.items():
+        if not dishes or isinstance(dishes[0], str): db[pool] = list(dishes); continue   # 水果池是字符串
+        out = list(dishes)
+        for k in range(1, scale):   # 副本没有菜谱 id (标签查询只命中原菜)
+            for d in dishes:
+                out.append(Dish(f"{d['name']}#{k}", d['ingredients'] + (rng.choice(extra),), d['full_ingredients']))
+        db[pool] = out
+    return db
+
+def make_profile(index, fridge_size, prefs, seed=0):
+    """冰箱 fridge_size 样、喜欢/不喜欢各 prefs 道的档案"""
+    rng = random.Random(seed)
+    names = [d['name'] for p in index.pools.values() for d in p.dishes]
+    vocab = list(index.ing_ids)
+    profile = default_profile()
+    profile['fridge_items'] = rng.sample(vocab, min(fridge_size, len(vocab)))
+    picked = rng.sample(names, min(2 * prefs, len(names)))
+    profile['likes'], profile['dislikes'] = picked[:prefs], picked[prefs:]
+    return profile
+
+
+def measure(fn, min_time):
+    """反复调用 fn 至少 min_time 秒 -> (ops/sec, 平均毫秒)"""
+    fn()   # 预热
+    n, start = 0, time.perf_counter()
+    while True:
+        fn(); n += 1
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time: return n / elapsed, elapsed / n * 1000
+
+def peak_memory(fn, ops=MEM_OPS):
+    """跑 ops 次的 tracemalloc 峰值 (KB)"""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        for _ in range(ops): fn()
+        return tracemalloc.get_traced_memory()[1] / 1024
+    finally: tracemalloc.stop()
+
+
+def session_memory(index, n=MEM_SESSIONS):
+    """n 个会话各生成一天 + 一周 + 换一次菜之后还留着的内存 -> (KB/会话, 每个会话耗时 ms)"""
+    warm = MenuSession(index=index); warm.generate(seed=0); warm.plan_week(seed=0)   # 进程级缓存先建好，不算到会话头上
+    gc.collect(); tracemalloc.start()
+    t, base = time.perf_counter(), tracemalloc.get_traced_memory()[0]
+    sessions = []
+    for i in range(n):
+        s = MenuSession(index=index, user_id=f"bench{i}"); s.generate(); s.plan_week(); s.swap("lunch_veg")
+        sessions.append(s)
+    elapsed = time.perf_counter() - t
+    gc.collect(); kb = (tracemalloc.get_traced_memory()[0] - base) / 1024 / n
+    tracemalloc.stop()
+    return kb, elapsed / n * 1000
+
+def cases(index, profile):
+    """用例名 -> 无参函数；都在同一个 MenuSession 上跑，和界面里的调用路径一致"""
+    session = MenuSession(profile, index=index, rng=random.Random(1))
+    session.generate()
+    slots = itertools.cycle(MENU_SLOTS)
+    def swap(): session.swap(next(slots))
+    def generate_cold():
+        index._samplers.clear(); session.generate()   # 抽样器缓存全部失效
+    return {
+        "generate": session.generate,
+        "generate_cold": generate_cold,
+        "generate_solver": lambda: session.generate(solver=True),
+        "swap": swap,
+        "shopping_full": session.refresh_shopping,
+        "shopping_slot": lambda: session.refresh_shopping("lunch_meat"),
+    }
+
+def run(scales, fridge_sizes, prefs_sizes, min_time, skip):
+    results = []
+    for scale in scales:
+        db = synthetic_db(scale)
+        gc.collect(); tracemalloc.start()
+        t = time.perf_counter(); index = RecipeIndex(db); build = time.perf_counter() - t
+        index_kb = tracemalloc.get_traced_memory()[0] / 1024; tracemalloc.stop()
+        dishes = sum(len(p.dishes) for p in index.pools.values())
+        print(f"== scale {scale}x: {dishes} 道菜, {len(index.ing_ids)} 种食材, 建索引 {build * 1000:.1f} ms, {index_kb:.0f} KB")
+        results.append({"case": "index_build", "scale": scale, "dishes": dishes, "ops_per_sec": 1 / build,
+                        "mean_ms": build * 1000, "peak_kb": index_kb})
+        for fridge in fridge_sizes:
+            for prefs in prefs_sizes:
+                profile = make_profile(index, fridge, prefs)
+                for name, fn in cases(index, profile).items():
+                    if name in skip: continue
+                    ops, mean_ms = measure(fn, min_time)
+                    peak = peak_memory(fn, 3 if name == "generate_solver" else MEM_OPS)
+                    results.append({"case": name, "scale": scale, "dishes": dishes, "fridge": fridge, "prefs": prefs,
+                                    "ops_per_sec": ops, "mean_ms": mean_ms, "peak_kb": peak})
+                    print(f"  {name:<16} fridge={fridge:<4} prefs={prefs:<4} {ops:>10.1f} ops/s {mean_ms:>9.3f} ms {peak:>9.1f} KB")
+        if vector_scoring.available() and "plan_days_batch" not in skip:
+            # 一次给 BATCH_PROFILES 个档案出菜单 (ops/sec 按档案数折算)
+            cat = vector_scoring.CatalogueMatrix(index)
+            profiles = [make_profile(index, fridge_sizes[-1], prefs_sizes[-1], seed=i) for i in range(BATCH_PROFILES)]
+            batch = lambda: vector_scoring.plan_days(profiles, seed=1, catalogue=cat)
+            ops, mean_ms = measure(batch, min_time)
+            peak = peak_memory(batch, 2)
+            results.append({"case": "plan_days_batch", "scale": scale, "dishes": dishes, "profiles": BATCH_PROFILES,
+                            "ops_per_sec": ops * BATCH_PROFILES, "mean_ms": mean_ms, "peak_kb": peak})
+            print(f"  {'plan_days_batch':<16} {ops * BATCH_PROFILES:>10.1f} 档案/s {mean_ms:>9.3f} ms {peak:>9.1f} KB")
+    # 每会话常驻内存 / 菜单卡片只和菜名有关，不随菜谱库规模变化
+    if "session_memory" not in skip:
+        kb, mean_ms = session_memory(RecipeIndex(RECIPES_DB))
+        results.append({"case": "session_memory", "scale": 1, "sessions": MEM_SESSIONS, "ops_per_sec": 1000 / mean_ms,
+                        "mean_ms": mean_ms, "kb_per_session": kb})
+        print(f"  {'session_memory':<16} {kb:>10.1f} KB/会话 {mean_ms:>9.3f} ms")
+    menu = MenuSession(index=RecipeIndex(RECIPES_DB), rng=random.Random(1)).generate()
+    card = lambda: create_menu_card_image(menu, "Bingo")
+    ops, mean_ms = measure(card, min_time)
+    results.append({"case": "menu_card", "scale": 1, "ops_per_sec": ops, "mean_ms": mean_ms, "peak_kb": peak_memory(card, 3)})
+    print(f"  {'menu_card':<16} {ops:>10.1f} ops/s {mean_ms:>9.3f} ms")
+    return results
+
+
+def git_commit():
+    try: return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True).stdout.strip()
+    except OSError: return ""
+
+def result_key(r): return (r["case"], r["scale"], r.get("fridge"), r.get("prefs"))
+
+def compare(old_path, results):
+    """和旧结果逐项对比 ops/sec (<1 表示变慢)"""
+    with open(old_path, "r", encoding="utf-8") as f: old = {result_key(r): r for r in json.load(f)["results"]}
+    print(f"== 对比 {old_path}")
+    for r in results:
+        o = old.get(result_key(r))
+        if not o: continue
+        ratio = r["ops_per_sec"] / o["ops_per_sec"]
+        flag = "  <-- 变慢" if ratio < 0.8 else ""
+        print(f"  {r['case']:<16} scale={r['scale']:<5} fridge={r.get('fridge')!s:<5} prefs={r.get('prefs')!s:<5} x{ratio:.2f}{flag}")
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="菜单引擎基准测试")
+    ap.add_argument("--scales", type=int, nargs="+", default=list(DEFAULT_SCALES))
+    ap.add_argument("--fridge", type=int, nargs="+", default=[4, 40])
+    ap.add_argument("--prefs", type=int, nargs="+", default=[0, 50])
+    ap.add_argument("--skip", nargs="*", default=[], help="跳过的用例名")
+    ap.add_argument("--quick", action="store_true", help="每个用例只跑 0.1 秒")
+    ap.add_argument("--out", help="结果 JSON 路径 (默认 benchmarks/results/<时间>.json)")
+    ap.add_argument("--compare", help="与之前的结果 JSON 对比")
+    args = ap.parse_args(argv)
+    results = run(args.scales, args.fridge, args.prefs, QUICK_MIN_TIME if args.quick else MIN_TIME, set(args.skip))
+    out = args.out or os.path.join(RESULT_DIR, datetime.datetime.now().strftime("%Y%m%d-%H%M%S") + ".json")
+    os.makedirs(os.path.dirname(os.path.abspath(out)), exist_ok=True)
+    meta = {"timestamp": datetime.datetime.now().isoformat(timespec="seconds"), "commit": git_commit(),
+            "python": platform.python_version(), "platform": platform.platform()}
+    with open(out, "w", encoding="utf-8") as f: json.dump({"meta": meta, "results": results}, f, ensure_ascii=False, indent=1)
+    print(f"结果已写入 {out}")
+    if args.compare: compare(args.compare, results)
+
+if __name__ == "__main__":
+    main()
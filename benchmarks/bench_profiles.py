@@ -0,0 +1,99 @@
+# benchmarks/bench_profiles.py
+# 档案读写延迟：旧版单文件 user_data.json (所有人一个文件、每次整体重写) 对比 按用户分文件 / SQLite
+#
+#   python benchmarks/bench_profiles.py                        # 100 / 1000 / 3000 个用户
+#   python benchmarks/bench_profiles.py --users 100 10000 --out profiles.json
+#
+# load_ms / save_ms : 已有 N 个用户时，读 / 存一个用户档案的平均耗时
+# burst             : 连续 50 次保存经过防抖层，调用方每次等待的耗时和最终落盘次数
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from kitchen_engine import default_profile
+from profile_store import DebouncedProfileStore, JsonProfileStore, SqliteProfileStore
+
+DEFAULT_USERS = (100, 1000, 3000)
+OPS = 200
+BURST = 50
+
+
+class LegacyStore:
+    """旧版：所有档案放在一个 JSON 里，读要解析整个文件，存要整体重写"""
+
+    def __init__(self, path): self.path = path
+    def _all(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f: return json.load(f)
+        except FileNotFoundError: return {}
+    def load(self, user_id): return self._all().get(user_id)
+    def save(self, user_id, data):
+        everyone = self._all(); everyone[user_id] = data
+        with open(self.path, "w", encoding="utf-8") as f: json.dump(everyone, f, ensure_ascii=False, indent=2)
+    def fill(self, ids, data):
+        with open(self.path, "w", encoding="utf-8") as f: json.dump({u: data for u in ids}, f, ensure_ascii=False, indent=2)
+
+
+def per_op_ms(fn, ids):
+    t = time.perf_counter()
+    for uid in ids: fn(uid)
+    return (time.perf_counter() - t) / len(ids) * 1000
+
+def measure(store, users, ops):
+    profile = default_profile()
+    ids = [f"u{i:06d}" for i in range(users)]
+    if isinstance(store, LegacyStore): store.fill(ids, profile)
+    else:
+        for uid in ids: store.save(uid, profile)
+    sample = random.Random(0).choices(ids, k=ops)
+    return {"load_ms": per_op_ms(store.load, sample), "save_ms": per_op_ms(lambda u: store.save(u, profile), sample)}
+
+def burst(store, n=BURST):
+    """同一个用户连点 n 次 (喜欢 / 不喜欢)：调用方只拍快照，落盘交给防抖线程"""
+    debounced = DebouncedProfileStore(store, delay=60)   # 测量期间不让计时器触发
+    profile = default_profile()
+    before = store.stats.summary().get("save", {}).get("count", 0)
+    t = time.perf_counter()
+    for i in range(n):
+        profile["likes"] = [f"菜{i}"]; debounced.save("burst", profile)
+    caller_ms = (time.perf_counter() - t) / n * 1000
+    debounced._timer.cancel(); debounced.flush()
+    return {"saves": n, "caller_ms": caller_ms, "writes": store.stats.summary()["save"]["count"] - before}
+
+def run(user_counts, ops):
+    out = {}
+    for users in user_counts:
+        d = tempfile.mkdtemp(prefix="youyou-profiles-")
+        stores = {"legacy": LegacyStore(os.path.join(d, "user_data.json")),
+                  "json": JsonProfileStore(os.path.join(d, "user_profiles")),
+                  "sqlite": SqliteProfileStore(os.path.join(d, "user_profiles.db"))}
+        for name, store in stores.items():
+            r = out.setdefault(name, {})[users] = measure(store, users, ops)
+            print(f"  {name:<7} {users:>6} 个用户  读 {r['load_ms']:8.3f} ms  存 {r['save_ms']:8.3f} ms")
+    for name in ("json", "sqlite"):
+        d = tempfile.mkdtemp(prefix="youyou-profiles-")
+        store = JsonProfileStore(os.path.join(d, "p")) if name == "json" else SqliteProfileStore(os.path.join(d, "p.db"))
+        b = out.setdefault("burst", {})[name] = burst(store)
+        print(f"  burst   {name:<7} {b['saves']} 次保存 -> 落盘 {b['writes']} 次，调用方每次 {b['caller_ms']:.3f} ms")
+    return out
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="档案读写延迟")
+    ap.add_argument("--users", type=int, nargs="+", default=list(DEFAULT_USERS))
+    ap.add_argument("--ops", type=int, default=OPS, help="每档测多少次读 / 存")
+    ap.add_argument("--out", help="结果 JSON 路径")
+    args = ap.parse_args(argv)
+    results = run(args.users, args.ops)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f: json.dump(results, f, ensure_ascii=False, indent=1)
+    return results
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+# benchmarks/bench_ui.py
+# 点击延迟：用 Streamlit AppTest 驱动页面，点 喜欢 / 不喜欢 / 换菜 / 加载更多，统计每次点击的耗时
+#
+#   python benchmarks/bench_ui.py                 # 当前代码
+#   python benchmarks/bench_ui.py --app /path/to/旧版/app.py --out before.json
+#
+# full_ms     : 整个脚本重跑一次的耗时 (AppTest 默认行为，每次点击都是整页)
+# fragment_ms : 像浏览器一样只把按钮所在的片段排进重跑队列，真正跑一次片段重跑的耗时
+#               (片段里 st.rerun() 升级成整页的，比如换菜，也算在里面)；片段重跑报错时直接失败
+import argparse
+import functools
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CLICKS = 20
+# 动作 -> 按钮 key
+ACTIONS = {"like": "lk_lunch_meat", "dislike": "dl_dinner_veg", "swap": "sw_lunch_veg", "history_more": "hist_more"}
+
+
+def percentile(xs, q):
+    xs = sorted(xs)
+    return xs[min(len(xs) - 1, int(round(q / 100 * (len(xs) - 1))))]
+
+def fragment_run(at, fragment_id, key=None):
+    """只重跑一个片段 (点 key 按钮)；AppTest 没有公开接口，这里给它的 RerunData 带上片段队列，和浏览器发的一样"""
+    import streamlit.testing.v1.local_script_runner as runner
+    rerun_data = runner.RerunData
+    runner.RerunData = functools.partial(rerun_data, fragment_id_queue=[fragment_id])
+    try: (at.button(key=key).click() if key else at).run()
+    finally: runner.RerunData = rerun_data
+
+def fragment_of(at, key):
+    """按钮 key -> 所在片段 id：逐个片段重跑一遍，看按钮画在哪个片段里"""
+    for fid in list(at._fragment_storage._fragments):
+        fragment_run(at, fid)
+        found = any(b.key == key for b in at.button)
+        at.run()   # 片段重跑后元素树只剩这个片段，整页跑一次恢复
+        if found: return fid
+    return None
+
+def run(app, clicks):
+    os.environ.setdefault("YOUYOU_FONT_DOWNLOAD", "0")
+    os.chdir(tempfile.mkdtemp())
+    sys.path.insert(0, os.path.dirname(os.path.abspath(app)))
+    from streamlit.testing.v1 import AppTest
+    from history_store import open_history_store
+    store = open_history_store()
+    for i in range(40): store.append({"date": f"2026-01-{i % 28 + 1:02d}", "menu": {"breakfast": "x", "lunch": ["y"], "dinner": ["z"], "fruit": "f"}})
+    at = AppTest.from_file(app, default_timeout=60)
+    at.run()
+    next(b for b in at.button if b.label == "✨ 生成今日菜单").click().run()
+    out = {}
+    for action, key in ACTIONS.items():
+        full, frag = [], []
+        fid = fragment_of(at, key)
+        for _ in range(clicks):
+            if action == "history_more": at.session_state.history_shown = 10
+            t = time.perf_counter()
+            at.button(key=key).click().run()
+            full.append((time.perf_counter() - t) * 1000)
+            assert not at.exception, at.exception
+            if fid is None: continue
+            if action == "history_more": at.session_state.history_shown = 10
+            t = time.perf_counter()
+            fragment_run(at, fid, key)
+            frag.append((time.perf_counter() - t) * 1000)
+            assert not at.exception, f"{action} 片段重跑出错: {at.exception[0].message}"
+            at.run()   # 恢复完整元素树，下一次才找得到按钮
+        frag = frag or [float("nan")]
+        out[action] = {"full_p50_ms": statistics.median(full), "full_p95_ms": percentile(full, 95),
+                       "fragment_p50_ms": statistics.median(frag), "fragment_p95_ms": percentile(frag, 95)}
+        print(f"  {action:<13} 整页 p50 {out[action]['full_p50_ms']:7.1f} ms  p95 {out[action]['full_p95_ms']:7.1f} ms"
+              f"   片段 p50 {out[action]['fragment_p50_ms']:6.2f} ms  p95 {out[action]['fragment_p95_ms']:6.2f} ms")
+    return out
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="页面点击延迟")
+    ap.add_argument("--app", default=os.path.join(ROOT, "app.py"))
+    ap.add_argument("--clicks", type=int, default=CLICKS)
+    ap.add_argument("--out", help="结果 JSON 路径")
+    args = ap.parse_args(argv)
+    app, out = os.path.abspath(args.app), args.out and os.path.abspath(args.out)
+    results = run(app, args.clicks)
+    if out:
+        with open(out, "w", encoding="utf-8") as f: json.dump({"app": app, "results": results}, f, ensure_ascii=False, indent=1)
+
+if __name__ == "__main__":
+    main()
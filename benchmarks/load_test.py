@@ -0,0 +1,132 @@
+# benchmarks/load_test.py
+# 并发会话压测：N 个模拟家庭 (每个一个 AppTest 会话) 同时按脚本点页面：打开 -> 生成 -> 换菜 -> 喜欢 -> 一键入库 -> 下载卡片
+# 统计每类操作的 p50 / p95 / p99 耗时和整体吞吐 (rerun/s)，看一个 app.py 进程能扛多少家庭
+#
+#   python benchmarks/load_test.py --sessions 20 --rounds 3
+#   python benchmarks/load_test.py --sessions 1 5 10 20 --out load.json    # 逐档加压
+#
+# 全程离线：字体下载关闭 (YOUYOU_FONT_DOWNLOAD=0，用本地 / PIL 默认字体)，不触发推送和拍照识别；档案 / 历史都写到临时目录
+# 所有会话在同一进程里跑，cache_resource (索引、历史、当日缓存) 和真实服务器一样是共享的
+# 下载按钮：AppTest 不会去取 download_button 的数据，这里直接调用按钮背后的 render_menu_card_png
+# AppTest 原本只考虑一次跑一个：每次 run 都新建 ScriptCache (重新编译 app.py)，并把全局 Runtime._instance 设成自己的 mock、跑完置空
+# 并发时会互相清掉；_share_app_globals 改成和真实服务器一样共用一份编译缓存和 runtime
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from bench_ui import ROOT, percentile
+
+SESSIONS = 10
+ROUNDS = 3
+TIMEOUT = 120
+# (操作名, 按钮 key 或文字)；每轮按这个顺序点一遍
+SCRIPT = (("generate", "✨ 生成今日菜单"), ("swap", "sw_lunch_veg"), ("like", "lk_lunch_meat"),
+          ("restock", "📦 一键入库"), ("download", None))
+
+
+def _share_app_globals():
+    from streamlit.runtime import Runtime
+    from streamlit.runtime.scriptrunner import script_cache
+    cache, lock = {}, threading.Lock()
+    init = script_cache.ScriptCache.__init__
+    def shared_init(self):
+        init(self); self._cache, self._lock = cache, lock
+    script_cache.ScriptCache.__init__ = shared_init
+    last = []
+    def instance(cls):
+        if cls._instance is not None: last[:] = [cls._instance]
+        if cls._instance is None and not last: raise RuntimeError("Runtime hasn't been created!")
+        return cls._instance or last[0]
+    Runtime.instance = classmethod(instance)
+    Runtime.exists = classmethod(lambda cls: cls._instance is not None or bool(last))
+
+def find_button(at, name):
+    for b in at.button:
+        if b.key == name or b.label == name: return b
+    return None
+
+def run_session(app, rounds, think, start, record):
+    """一个家庭：打开页面后按 SCRIPT 点 rounds 轮；每次操作的耗时交给 record"""
+    from streamlit.testing.v1 import AppTest
+    from menu_card import menu_card_key, render_menu_card_png
+    at = AppTest.from_file(app, default_timeout=TIMEOUT)
+    start.wait()
+    t = time.perf_counter(); at.run(); record("open", time.perf_counter() - t, at)
+    for _ in range(rounds):
+        for action, target in SCRIPT:
+            if think: time.sleep(think)
+            t = time.perf_counter()
+            if action == "download":
+                engine = at.session_state.engine
+                if not engine.has_menu(): continue
+                render_menu_card_png(*menu_card_key(engine.menu, engine.profile['nickname']))
+                record(action, time.perf_counter() - t, None)
+                continue
+            b = find_button(at, target)
+            if b is None:
+                if action != "restock": record(action, None, at, f"找不到按钮 {target}")
+                continue   # 没有缺货时不显示 一键入库
+            b.click().run()
+            record(action, time.perf_counter() - t, at)
+
+def load_test(app, sessions, rounds, think=0.0):
+    """sessions 个会话同时开跑 -> {"actions": {操作: 统计}, "total": ..., "throughput": rerun/s, "errors": n}"""
+    samples, errors, lock = {}, [], threading.Lock()
+    def record(action, dt, at, error=None):
+        with lock:
+            if dt is not None: samples.setdefault(action, []).append(dt * 1000)
+            if error: errors.append(f"{action}: {error}")
+            elif at is not None and at.exception: errors.append(f"{action}: {at.exception[0].message}")
+    start = threading.Barrier(sessions + 1)
+    with ThreadPoolExecutor(max_workers=sessions) as pool:
+        futs = [pool.submit(run_session, app, rounds, think, start, record) for _ in range(sessions)]
+        start.wait(); t0 = time.perf_counter()
+        for f in futs:
+            try: f.result()
+            except Exception as e: errors.append(repr(e))
+        wall = time.perf_counter() - t0
+    def summary(xs):
+        return {"count": len(xs), "p50_ms": statistics.median(xs), "p95_ms": percentile(xs, 95),
+                "p99_ms": percentile(xs, 99), "max_ms": max(xs)}
+    reruns = [x for a, xs in samples.items() if a != "download" for x in xs]
+    return {"sessions": sessions, "rounds": rounds, "wall_s": wall, "throughput": len(reruns) / wall if wall else 0.0,
+            "actions": {a: summary(xs) for a, xs in samples.items()}, "total": summary(reruns) if reruns else None,
+            "errors": len(errors), "first_errors": errors[:5]}
+
+def report(r):
+    print(f"== {r['sessions']} 个会话 x {r['rounds']} 轮: {r['wall_s']:.1f} s, 吞吐 {r['throughput']:.1f} rerun/s, 错误 {r['errors']}")
+    rows = list(r["actions"].items()) + ([("rerun 合计", r["total"])] if r["total"] else [])
+    for name, s in rows:
+        print(f"  {name:<10} n={s['count']:<5} p50 {s['p50_ms']:8.1f} ms  p95 {s['p95_ms']:8.1f} ms  p99 {s['p99_ms']:8.1f} ms  max {s['max_ms']:8.1f} ms")
+    for e in r["first_errors"]: print(f"  ! {e}")
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="并发会话压测")
+    ap.add_argument("--app", default=os.path.join(ROOT, "app.py"))
+    ap.add_argument("--sessions", type=int, nargs="+", default=[SESSIONS], help="并发会话数，可给多个逐档加压")
+    ap.add_argument("--rounds", type=int, default=ROUNDS, help="每个会话把脚本点几遍")
+    ap.add_argument("--think", type=float, default=0.0, help="每次点击前停顿的秒数 (模拟真人)")
+    ap.add_argument("--out", help="结果 JSON 路径")
+    args = ap.parse_args(argv)
+    app, out = os.path.abspath(args.app), args.out and os.path.abspath(args.out)
+    os.environ["YOUYOU_FONT_DOWNLOAD"] = "0"   # 离线
+    os.environ.setdefault("YOUYOU_MULTI_USER", "1")   # 每个会话一个家庭
+    os.chdir(tempfile.mkdtemp(prefix="youyou-load-"))
+    sys.path.insert(0, os.path.dirname(app))
+    _share_app_globals()
+    results = []
+    for n in args.sessions:
+        results.append(load_test(app, n, args.rounds, args.think)); report(results[-1])
+    if out:
+        with open(out, "w", encoding="utf-8") as f: json.dump({"app": app, "results": results}, f, ensure_ascii=False, indent=1)
+    return results
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+# card_html.py
+# 菜卡片 / 烹饪模式的 HTML 片段，按 (菜名, 冰箱状态) 缓存 (有上限)；不依赖 Streamlit
+from functools import lru_cache
+from normalizer import normalize_ingredient
+from shopping import format_item
+
+CARD_HTML_CACHE_SIZE = 512
+COOK_HTML_CACHE_SIZE = 64
+FRIDGE_STATE_CACHE_SIZE = 64
+DIVIDER_HTML = "<hr style='margin:5px 15px; border:0; border-top:1px solid #F0F0F0;'>"
+
+@lru_cache(maxsize=FRIDGE_STATE_CACHE_SIZE)
+def fridge_state(items):
+    """冰箱食材 (tuple) -> 归一化后的 frozenset；frozenset 自带哈希缓存，做缓存键很便宜"""
+    return frozenset(normalize_ingredient(i) for i in items)
+
+def dish_name_html(name): return f'<div class="dish-name-text">{name}</div>'
+
+@lru_cache(maxsize=CARD_HTML_CACHE_SIZE)
+def _pills(name, ingredients, fridge):
+    pills = "".join(f'<span class="{"ing-pill ing-hit" if normalize_ingredient(ing) in fridge else "ing-pill"}">{ing}</span>' for ing in ingredients)
+    return f'<div class="ing-scroll">{pills}</div>'
+
+def ingredient_pills_html(dish, fridge):
+    """食材条 (冰箱里有的高亮)；fridge 为 fridge_state() 的结果"""
+    return _pills(dish['name'], tuple(dish['ingredients']), fridge)
+
+@lru_cache(maxsize=COOK_HTML_CACHE_SIZE)
+def _cook_view(name, time, difficulty, ingredients, steps):
+    pills = ' '.join(f'<span style="background:white; border:1px solid #EEE; padding:2px 8px; border-radius:8px; margin:2px; display:inline-block;">{i}</span>' for i in ingredients)
+    steps_html = ''.join(f'<div style="margin-bottom:15px;"><b>{i + 1}.</b> {s}</div>' for i, s in enumerate(steps))
+    return f"""
+    <div style="background:white; border-radius:20px; padding:20px; margin-top:10px;">
+        <h2 style="text-align:center;">{name}</h2>
+        <div style="text-align:center; color:#888; margin:10px 0;">{time} | {difficulty}</div>
+        <div style="background:#F9F9F9; padding:15px; border-radius:10px; margin-bottom:20px;">
+            {pills}
+        </div>
+        {steps_html}
+    </div>"""
+
+def shopping_receipt_html(groups):
+    """缺货清单小票；groups 为 ShoppingList.grouped() 的结果"""
+    body = ''.join(f'<p><b>{c}</b><br>{"、".join(format_item(i) for i in items)}</p>' for c, items in groups.items())
+    return f"""
+    <div class="receipt-card">
+        <h4>🛒 缺货清单</h4>
+        {body}
+    </div>"""
+
+def history_card_html(item):
+    m = item['menu']
+    first = lambda names: next((n for n in names if n), "")   # 选不出菜的格子是空的
+    return f"""
+    <div class="hist-card">
+        <div class="hist-head">📅 {item['date']}</div>
+        <div class="hist-txt">
+        🌅 {m['breakfast']}<br>
+        ☀️ {first(m['lunch'])}...<br>
+        🌙 {first(m['dinner'])}...
+        </div>
+    </div>"""
+
+def cook_view_html(d):
+    """烹饪模式整页 (d 为含做法的完整菜谱)"""
+    return _cook_view(d['name'], d.get('time', '--'), d.get('difficulty', '--'), tuple(d['ingredients']), tuple(d.get('steps_list', [])))
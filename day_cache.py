@@ -0,0 +1,107 @@
+# day_cache.py
+# 已生成的一天菜单缓存：键 = (缓存版本, 种子, 档案里影响选菜的字段, 菜谱库指纹 + 菜谱文件摘要, 是否求解模式, 最近吃过的降权摘要)
+# 进程内 LRU + 可选磁盘目录 (多进程 / 重启后共享)；只存菜名，读回时用索引还原成菜
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from menu_engine import DAY_SLOTS
+
+CACHE_DIR = os.environ.get("YOUYOU_DAY_CACHE", "day_cache")   # 置空则只用进程内缓存
+MEMORY_SIZE = 512
+TTL_DAYS = 7   # 磁盘上超过这么多天的条目打开时清掉
+PROFILE_FIELDS = ("fridge_items", "allergens", "likes", "dislikes", "nutrition_goals", "dish_filter")
+CACHE_VERSION = 2   # 选菜 / 求解 / 过敏原规则改了、同样输入会出不同菜单时加一，旧缓存 (含磁盘上的) 自动作废
+
+
+@lru_cache(maxsize=8)
+def _file_digest(path, mtime_ns, size):
+    h = hashlib.sha1()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 16), b""): h.update(block)
+    return h.hexdigest()
+
+def recipes_digest(path=None):
+    """菜谱文件整份内容的摘要 (标签 / 营养 / 难度改了也算，索引指纹只看菜名和食材)；文件没变时不重读"""
+    if path is None: from recipe_data import RECIPE_FILE as path
+    try: info = os.stat(path)
+    except OSError: return ""
+    return _file_digest(path, info.st_mtime_ns, info.st_size)
+
+def cache_key(seed, profile, index, solver=False, recent=""):
+    prof = {}
+    for f in PROFILE_FIELDS:
+        v = profile.get(f) or ()
+        prof[f] = v if isinstance(v, str) else sorted(v)   # 筛选条件是字符串，其余是列表
+    raw = json.dumps([CACHE_VERSION, seed, prof, index.fingerprint(), recipes_digest(), bool(solver), recent], ensure_ascii=False, sort_keys=True)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+def encode_menu(menu):
+    out = {slot: menu[slot]['name'] if menu.get(slot) else None for slot, _ in DAY_SLOTS}
+    out['fruit'] = menu.get('fruit')
+    return out
+
+def decode_menu(data, index):
+    """菜名 -> 菜；菜谱里已经没有这道菜时返回 None (当作未命中)"""
+    menu = {}
+    for slot, pool_key in DAY_SLOTS:
+        name = data.get(slot)
+        if name is None: menu[slot] = None; continue
+        p = index.pool(pool_key)
+        i = p.names.get(name) if p else None
+        if i is None: return None
+        menu[slot] = p.dishes[i]
+    menu['fruit'] = data.get('fruit')
+    return menu
+
+
+class DayCache:
+    def __init__(self, directory=CACHE_DIR, size=MEMORY_SIZE, ttl_days=TTL_DAYS):
+        self.dir, self.size, self.ttl = directory, size, ttl_days * 86400
+        self._mem = OrderedDict()
+        self._lock = threading.Lock()
+        if self.dir:
+            os.makedirs(self.dir, exist_ok=True)
+            self._prune()
+
+    def _path(self, key): return os.path.join(self.dir, f"{key}.json")
+
+    def _prune(self):
+        cutoff = time.time() - self.ttl
+        for name in os.listdir(self.dir):
+            path = os.path.join(self.dir, name)
+            try:
+                if os.path.getmtime(path) < cutoff: os.remove(path)
+            except OSError: pass
+
+    def _remember(self, key, data):
+        with self._lock:
+            self._mem[key] = data; self._mem.move_to_end(key)
+            if len(self._mem) > self.size: self._mem.popitem(last=False)
+
+    def get(self, key, index):
+        with self._lock:
+            data = self._mem.get(key)
+            if data is not None: self._mem.move_to_end(key)
+        if data is None and self.dir:
+            try:
+                with open(self._path(key), "r", encoding="utf-8") as f: data = json.load(f)
+            except (OSError, ValueError): return None
+            self._remember(key, data)
+        return decode_menu(data, index) if data is not None else None
+
+    def put(self, key, menu):
+        data = encode_menu(menu)
+        self._remember(key, data)
+        if not self.dir: return
+        fd, tmp = tempfile.mkstemp(suffix=".tmp", dir=self.dir)
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f: json.dump(data, f, ensure_ascii=False)
+            os.replace(tmp, self._path(key))
+        except OSError:
+            try: os.unlink(tmp)
+            except OSError: pass
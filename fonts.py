@@ -0,0 +1,93 @@
+# fonts.py
+# 中文字体供给：本地路径 > 已下载的 SimHei > 项目自带 / 系统字体 > PIL 默认字体
+# 网络下载是可选的，只在后台线程里跑一次，绝不阻塞页面启动
+# 路径只解析一次 (下载完成时更新)；一个中文字体都没有时 font_status() 给出提示，页面 / 命令行要显示出来，不能默默画方块
+import glob
+import os
+import tempfile
+import threading
+from functools import lru_cache
+import requests
+from PIL import ImageFont
+import perf
+
+FONT_FILE = "SimHei.ttf"   # 下载后的缓存位置
+FONT_URL = "https://github.com/StellarCN/scp_zh/raw/master/fonts/SimHei.ttf"
+LOCAL_FONT = os.environ.get("YOUYOU_FONT_PATH", "")                     # 指定本地字体时优先使用
+FONT_DOWNLOAD = os.environ.get("YOUYOU_FONT_DOWNLOAD", "1") != "0"     # 设为 0 可完全离线
+BUNDLED_FONT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fonts")
+SYSTEM_FONTS = [
+    "/usr/share/fonts/opentype/noto/NotoSansCJK-Regular.ttc",
+    "/usr/share/fonts/noto-cjk/NotoSansCJK-Regular.ttc",
+    "/usr/share/fonts/truetype/wqy/wqy-microhei.ttc",
+    "/usr/share/fonts/truetype/wqy/wqy-zenhei.ttc",
+    "/System/Library/Fonts/PingFang.ttc",
+    "/System/Library/Fonts/STHeiti Medium.ttc",
+    "C:/Windows/Fonts/simhei.ttf",
+    "C:/Windows/Fonts/msyh.ttc",
+]
+
+_download_lock = threading.Lock()
+_download_started = False
+_resolved = []   # [字体路径或 None]；第一次用到时解析，后台下载成功后换成下载的字体
+
+def _bundled_fonts():
+    out = []
+    for ext in ("ttf", "ttc", "otf"): out.extend(sorted(glob.glob(os.path.join(BUNDLED_FONT_DIR, f"*.{ext}"))))
+    return out
+
+def _find_font():
+    for p in [LOCAL_FONT, FONT_FILE] + _bundled_fonts() + SYSTEM_FONTS:
+        if p and os.path.exists(p): return p
+    return None
+
+def font_path():
+    """当前可用的中文字体路径 (只查一次磁盘)；一个都没有时返回 None (用 PIL 默认字体)"""
+    if not _resolved: _resolved[:] = [_find_font()]
+    return _resolved[0]
+
+def font_status():
+    """有中文字体时返回 None，否则返回给用户看的提示"""
+    if font_path() is not None: return None
+    if _download_started: return "中文字体正在后台下载，下载完成前卡片里的中文会显示成方块"
+    return "没有找到中文字体，卡片里的中文会显示成方块：请设置 YOUYOU_FONT_PATH，或放一个字体到 fonts/ 目录，或允许联网下载"
+
+@perf.timed("font.download")
+def download_font(url=FONT_URL, dest=FONT_FILE, timeout=15):
+    """下载字体：先写同目录临时文件，校验能打开后再原子改名，别的会话不会读到半个文件"""
+    r = requests.get(url, timeout=timeout)
+    r.raise_for_status()
+    fd, tmp = tempfile.mkstemp(prefix=".font-", suffix=".tmp", dir=os.path.dirname(os.path.abspath(dest)))
+    try:
+        with os.fdopen(fd, "wb") as f: f.write(r.content)
+        ImageFont.truetype(tmp, 12)
+        os.replace(tmp, dest)
+    except:
+        os.unlink(tmp); raise
+    return dest
+
+def _download_worker():
+    try: _resolved[:] = [download_font()]
+    except: pass   # 下载失败就继续用兜底字体 (font_status 会提示)
+
+def prefetch_font():
+    """本地没有中文字体时，在后台线程下载一次；立即返回"""
+    global _download_started
+    if not FONT_DOWNLOAD or font_path() is not None: return
+    with _download_lock:
+        if _download_started: return
+        _download_started = True
+    threading.Thread(target=_download_worker, name="font-download", daemon=True).start()
+
+@lru_cache(maxsize=None)
+@perf.timed("font.load")
+def _load_font(path, size):
+    if path:
+        try: return ImageFont.truetype(path, size)
+        except: pass
+    try: return ImageFont.load_default(size)
+    except TypeError: return ImageFont.load_default()   # Pillow < 10.1 没有 size 参数
+
+def get_pil_font(size):
+    """按 (字体路径, 字号) 缓存 FreeTypeFont 对象；下载完成后自动换成新字体"""
+    return _load_font(font_path(), size)
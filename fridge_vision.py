@@ -0,0 +1,149 @@
+# fridge_vision.py
+# 冰箱拍照识别：可插拔识别器 + 后台线程/进程池 + 按图片哈希缓存结果
+# 自带一个离线参考实现 (颜色直方图匹配)，不依赖任何云服务
+import glob
+import hashlib
+import importlib
+import io
+import os
+import threading
+from abc import ABC, abstractmethod
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from PIL import Image
+from normalizer import normalize_ingredient
+import perf
+
+SAMPLE_DIR = os.environ.get("YOUYOU_FRIDGE_SAMPLES", os.path.join(os.path.dirname(os.path.abspath(__file__)), "fridge_samples"))
+RESULT_CACHE_SIZE = 128
+_LEVELS = 4        # 每个通道量化成 4 档 -> 64 个颜色桶
+_THUMB = 64        # 先缩到 64x64 再统计
+_MIN_CHROMA = 40   # 去掉接近黑白灰的像素 (冰箱内壁、阴影)
+
+# 自带参考色板：食材 -> [(RGB, 权重)]；fridge_samples/ 里放了同名样图时以样图为准
+REFERENCE_PALETTES = {
+    "西红柿": [((210, 35, 30), 3), ((235, 70, 50), 1)],
+    "胡萝卜": [((240, 125, 25), 3), ((250, 150, 60), 1)],
+    "西兰花": [((45, 120, 45), 3), ((80, 145, 60), 1)],
+    "青菜": [((95, 175, 65), 2), ((160, 210, 120), 1)],
+    "黄瓜": [((55, 110, 40), 2), ((130, 175, 85), 1)],
+    "南瓜": [((230, 150, 35), 2), ((200, 110, 20), 1)],
+    "玉米": [((245, 205, 55), 3), ((230, 180, 40), 1)],
+    "土豆": [((205, 165, 105), 2), ((180, 135, 80), 1)],
+    "茄子": [((75, 30, 85), 3), ((110, 60, 120), 1)],
+    "红薯": [((125, 50, 110), 2), ((190, 90, 60), 1)],
+    "香菇": [((120, 80, 50), 2), ((90, 60, 40), 1)],
+    "牛肉": [((145, 30, 35), 3), ((110, 25, 25), 1)],
+    "猪肉": [((225, 150, 140), 3), ((240, 190, 175), 1)],
+    "虾仁": [((245, 145, 120), 2), ((250, 190, 165), 1)],
+    "三文鱼": [((250, 130, 80), 3), ((245, 165, 120), 1)],
+}
+MATCH_THRESHOLD = 0.12
+MAX_LABELS = 6
+
+
+class Recognizer(ABC):
+    """识别器接口：图片字节 -> 原始食材名列表 (之后统一走归一化)"""
+
+    @abstractmethod
+    def recognize(self, image_bytes): ...
+
+
+def _bucket(rgb):
+    step = 256 // _LEVELS
+    r, g, b = rgb
+    return (r // step) * _LEVELS * _LEVELS + (g // step) * _LEVELS + b // step
+
+def colour_histogram(img):
+    """彩色像素的量化直方图 (归一化到和为 1)；全是灰白时返回空"""
+    img = img.convert("RGB"); img.thumbnail((_THUMB, _THUMB))
+    hist, total = {}, 0
+    for px in img.getdata():
+        if max(px) - min(px) < _MIN_CHROMA: continue
+        k = _bucket(px); hist[k] = hist.get(k, 0) + 1; total += 1
+    return {k: v / total for k, v in hist.items()} if total else {}
+
+def palette_histogram(palette):
+    hist, total = {}, sum(w for _, w in palette)
+    for rgb, w in palette:
+        k = _bucket(rgb); hist[k] = hist.get(k, 0) + w / total
+    return hist
+
+
+class ColourHistogramRecognizer(Recognizer):
+    """参考实现：把照片的颜色分布和每种食材的参考直方图做交集匹配"""
+
+    def __init__(self, palettes=None, sample_dir=SAMPLE_DIR, threshold=MATCH_THRESHOLD, max_labels=MAX_LABELS):
+        self.threshold, self.max_labels = threshold, max_labels
+        self.references = {label: palette_histogram(p) for label, p in (palettes or REFERENCE_PALETTES).items()}
+        self.references.update(self._load_samples(sample_dir))
+
+    @staticmethod
+    def _load_samples(sample_dir):
+        """fridge_samples/西红柿_1.jpg 这类样图 -> {食材: 直方图}"""
+        refs = {}
+        for path in sorted(glob.glob(os.path.join(sample_dir or "", "*"))):
+            label = os.path.splitext(os.path.basename(path))[0].split("_")[0]
+            try:
+                with Image.open(path) as im: h = colour_histogram(im)
+            except OSError: continue
+            if h: refs[label] = h
+        return refs
+
+    def recognize(self, image_bytes):
+        with Image.open(io.BytesIO(image_bytes)) as im: hist = colour_histogram(im)
+        scores = []
+        for label, ref in self.references.items():
+            s = sum(min(v, ref[k]) for k, v in hist.items() if k in ref)
+            if s >= self.threshold: scores.append((s, label))
+        return [label for _, label in sorted(scores, reverse=True)[:self.max_labels]]
+
+
+def load_recognizer(spec=None):
+    """YOUYOU_RECOGNIZER=模块:类名 可以换成真模型；默认用颜色直方图参考实现"""
+    spec = spec or os.environ.get("YOUYOU_RECOGNIZER", "")
+    if not spec: return ColourHistogramRecognizer()
+    module, _, cls = spec.partition(":")
+    return getattr(importlib.import_module(module), cls)()
+
+
+@perf.timed("vision.recognize")
+def _recognize_in_worker(recognizer, image_bytes): return recognizer.recognize(image_bytes)
+
+
+class RecognitionService:
+    """把识别丢到后台执行；同一张图 (按 sha256) 只识别一次，正在识别的也会合并"""
+
+    def __init__(self, recognizer=None, max_workers=2, use_processes=False):
+        self.recognizer = recognizer or load_recognizer()
+        pool = ProcessPoolExecutor if use_processes else ThreadPoolExecutor
+        self.executor = pool(max_workers=max_workers)
+        self._results = {}   # 图片哈希 -> Future (插入顺序即 LRU 顺序)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def image_key(image_bytes): return hashlib.sha256(image_bytes).hexdigest()
+
+    def submit(self, image_bytes):
+        """返回 Future，结果是归一化后的食材名列表"""
+        key = self.image_key(image_bytes)
+        with self._lock:
+            fut = self._results.pop(key, None)
+            if fut is None or (fut.done() and fut.exception()):
+                raw = self.executor.submit(_recognize_in_worker, self.recognizer, image_bytes)
+                fut = Future()
+                raw.add_done_callback(lambda r, out=fut: self._finish(r, out))
+            self._results[key] = fut
+            while len(self._results) > RESULT_CACHE_SIZE: self._results.pop(next(iter(self._results)))
+        return fut
+
+    @staticmethod
+    def _finish(raw, out):
+        try: labels = raw.result()
+        except Exception as e: out.set_exception(e); return
+        items = []
+        for label in labels:
+            n = normalize_ingredient(label)
+            if n not in items: items.append(n)
+        out.set_result(items)
+
+    def recognize(self, image_bytes, timeout=None): return self.submit(image_bytes).result(timeout)
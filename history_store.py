@@ -0,0 +1,167 @@
+# history_store.py
+# 历史收藏存储：追加写 O(1)，按"最新 N 条"分页读 (可只看一个用户的)；JSON Lines (默认) 或 SQLite
+import contextlib
+import json
+from abc import ABC, abstractmethod
+import os
+import sqlite3
+import threading
+from itertools import islice
+from profile_store import DEFAULT_USER
+import perf
+
+try: import fcntl
+except ImportError: fcntl = None   # Windows 下退化为进程内锁
+
+LEGACY_FILE = "menu_history.json"
+JSONL_FILE = "menu_history.jsonl"
+SQLITE_FILE = "menu_history.db"
+_READ_BLOCK = 8192
+
+_thread_lock = threading.RLock()
+
+
+@contextlib.contextmanager
+def file_lock(path):
+    """对 path + '.lock' 加排他锁 (跨进程 flock + 进程内互斥)"""
+    with _thread_lock:
+        with open(path + ".lock", "a") as lf:
+            if fcntl: fcntl.flock(lf, fcntl.LOCK_EX)
+            try: yield
+            finally:
+                if fcntl: fcntl.flock(lf, fcntl.LOCK_UN)
+
+
+def item_user(item):
+    """历史条目是谁收藏的；没记用户的老条目算 default"""
+    return item.get('user') or DEFAULT_USER
+
+
+class HistoryStore(ABC):
+    """历史存储接口：item 形如 {"date": ..., "menu": {...}, "user": ...}，读出来新的在前；漏实现方法的后端在创建时就报错
+
+    recent 给了 user 时只数这个用户的条目 (limit / offset 也按过滤后的算)，多户共用一个文件时各看各的。
+    """
+
+    @abstractmethod
+    def append(self, item): ...
+    @abstractmethod
+    def recent(self, limit=10, offset=0, user=None): ...
+    @abstractmethod
+    def count(self): ...
+
+    def _load_legacy(self, legacy):
+        """旧版 menu_history.json (整体数组，新的在前)；读不出来当空"""
+        if not legacy or not os.path.exists(legacy): return None
+        try:
+            with open(legacy, "r", encoding="utf-8") as f: return json.load(f)
+        except: return []
+
+
+class JsonlHistoryStore(HistoryStore):
+    """每行一条，旧的在前；追加只写一行，读最新 N 条时从文件尾部倒着读"""
+
+    def __init__(self, path=JSONL_FILE, legacy=LEGACY_FILE):
+        self.path = path
+        self._migrate(legacy)
+
+    def _migrate(self, legacy):
+        with file_lock(self.path):
+            if os.path.exists(self.path): return
+            old = self._load_legacy(legacy)
+            if old is None: return
+            tmp = self.path + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                for item in reversed(old): f.write(json.dumps(item, ensure_ascii=False) + "\n")
+            os.replace(tmp, self.path)
+            os.replace(legacy, legacy + ".migrated")
+
+    @perf.timed("history.append")
+    def append(self, item):
+        line = (json.dumps(item, ensure_ascii=False) + "\n").encode("utf-8")
+        with file_lock(self.path):
+            with open(self.path, "ab") as f: f.write(line)
+
+    def _iter_from_end(self):
+        """从文件尾部倒着逐行给出 (新的在前)，调用方停下时就不再往前读"""
+        if not os.path.exists(self.path): return
+        rest = b""
+        with open(self.path, "rb") as f:
+            pos = f.seek(0, os.SEEK_END)
+            while pos > 0:
+                step = min(_READ_BLOCK, pos); pos -= step
+                f.seek(pos); chunk = f.read(step) + rest
+                parts = chunk.split(b"\n")
+                rest = parts.pop(0)   # 块首可能是半行，留给下一轮
+                yield from (p for p in reversed(parts) if p.strip())
+            if rest.strip(): yield rest
+
+    def _items_from_end(self):
+        for raw in self._iter_from_end():
+            try: yield json.loads(raw)
+            except ValueError: pass   # 跳过写坏的行
+
+    @perf.timed("history.recent")
+    def recent(self, limit=10, offset=0, user=None):
+        items = self._items_from_end()
+        if user is not None: items = (i for i in items if item_user(i) == user)   # 往前读到凑够这个用户的条数为止
+        return list(islice(items, offset, offset + limit))
+
+    def count(self):
+        if not os.path.exists(self.path): return 0
+        with open(self.path, "rb") as f: return sum(1 for line in f if line.strip())
+
+
+class SqliteHistoryStore(HistoryStore):
+    """SQLite 版：并发写由 SQLite 自己加锁，分页走主键倒序"""
+
+    def __init__(self, path=SQLITE_FILE, legacy=LEGACY_FILE):
+        self.path = path
+        with self._connect() as db, db:
+            db.execute("CREATE TABLE IF NOT EXISTS history (id INTEGER PRIMARY KEY AUTOINCREMENT, date TEXT NOT NULL, menu TEXT NOT NULL, user TEXT)")
+            if "user" not in {row[1] for row in db.execute("PRAGMA table_info(history)")}:
+                db.execute("ALTER TABLE history ADD COLUMN user TEXT")   # 老库没有 user 列，老条目留 NULL (= default)
+            db.execute("CREATE INDEX IF NOT EXISTS history_user ON history (user, id)")
+        self._migrate(legacy)
+
+    def _connect(self): return contextlib.closing(sqlite3.connect(self.path, timeout=10))
+
+    def _migrate(self, legacy):
+        with file_lock(self.path):
+            old = self._load_legacy(legacy)
+            if old is None: return
+            with self._connect() as db, db:
+                db.executemany("INSERT INTO history (date, menu, user) VALUES (?, ?, ?)", [self._row(i) for i in reversed(old)])
+            os.replace(legacy, legacy + ".migrated")
+
+    @staticmethod
+    def _row(item): return item["date"], json.dumps(item["menu"], ensure_ascii=False), item.get("user")
+
+    @perf.timed("history.append")
+    def append(self, item):
+        with self._connect() as db, db:
+            db.execute("INSERT INTO history (date, menu, user) VALUES (?, ?, ?)", self._row(item))
+
+    @perf.timed("history.recent")
+    def recent(self, limit=10, offset=0, user=None):
+        sql, args = "SELECT date, menu, user FROM history", ()
+        if user is not None:   # 没记用户的老条目算 default
+            sql, args = sql + " WHERE user = ?" + (" OR user IS NULL" if user == DEFAULT_USER else ""), (user,)
+        with self._connect() as db:
+            rows = db.execute(sql + " ORDER BY id DESC LIMIT ? OFFSET ?", args + (limit, offset)).fetchall()
+        out = []
+        for d, m, u in rows:
+            item = {"date": d, "menu": json.loads(m)}
+            if u: item["user"] = u
+            out.append(item)
+        return out
+
+    def count(self):
+        with self._connect() as db: return db.execute("SELECT COUNT(*) FROM history").fetchone()[0]
+
+
+def open_history_store(backend=None):
+    """按 YOUYOU_HISTORY_BACKEND (jsonl / sqlite) 选后端，默认 jsonl"""
+    backend = backend or os.environ.get("YOUYOU_HISTORY_BACKEND", "jsonl")
+    if backend == "sqlite": return SqliteHistoryStore()
+    return JsonlHistoryStore()
@@ -0,0 +1,185 @@
+# kitchen_engine.py
+# 无界面的菜单引擎：选菜、缺货清单、周计划、历史收藏都在这里，不依赖 Streamlit
+# app.py 只负责渲染；命令行 / HTTP 服务 / 基准测试直接 import 这个模块即可
+import argparse
+import datetime
+import json
+import random
+from day_cache import cache_key
+from menu_engine import DAY_SLOTS, default_index, derive_seed, pick_dish, plan_day, plan_menus
+from menu_solver import solve_day, solve_menus
+from shopping import ShoppingList
+import perf
+
+MENU_SLOTS = tuple(s for s, _ in DAY_SLOTS)
+SLOT_POOLS = dict(DAY_SLOTS)
+
+def default_profile():
+    return {
+        "nickname": "Bingo", "age": "2岁", "height": "90", "weight": "13",
+        "nutrition_goals": ["补钙"], "dish_filter": "", "allergens": [],
+        "fridge_items": ["鸡蛋", "牛肉", "西红柿", "土豆"],
+        "pushplus_token": "", "dislikes": [], "likes": []
+    }
+
+def empty_menu(): return dict.fromkeys(MENU_SLOTS + ("fruit",))
+
+def history_item(menu, date=None, user_id=None):
+    """当天菜单 -> 历史收藏条目 (只存菜名；选不出菜的空格子存 "")；user_id 给了就记上是谁的"""
+    name = lambda k: menu[k]['name'] if menu.get(k) else ""
+    item = {
+        "date": (date or datetime.date.today()).strftime("%Y-%m-%d"),
+        "menu": {
+            "breakfast": name('breakfast'),
+            "lunch": [name('lunch_meat'), name('lunch_veg'), name('lunch_soup')],
+            "dinner": [name('dinner_meat'), name('dinner_veg'), name('dinner_soup')],
+            "fruit": menu.get('fruit') or ""
+        }
+    }
+    if user_id: item["user"] = user_id
+    return item
+
+
+class MenuSession:
+    """一个用户的会话：档案 + 今日菜单 + 缺货清单 + 周计划
+
+    profile 原地修改；传了 store (ProfileStore) 时改动后自动保存，history (HistoryStore) 可选。
+    recency (RecencyIndex) 可选：这个用户自己的最近吃过的菜 (按 user_id 建)，给了就降权，收藏时顺带更新它。
+    不给种子时按 (用户, 日期, 当天第几次生成) 派生，同样的输入得到同样的菜单；day_cache (DayCache) 可选。
+    """
+
+    def __init__(self, profile=None, index=None, rng=None, store=None, user_id=None, history=None, day_cache=None, recency=None):
+        self.profile = profile if profile is not None else default_profile()
+        self.index = index or default_index()
+        self.rng = rng   # 不给时每次换菜用 (种子, 第几次) 现派生一个，会话里不常驻一份 Random 状态 (约 2.5KB)
+        self.swap_seed, self.swaps = derive_seed(user_id or "", "pick"), 0
+        self.store, self.user_id, self.history, self.day_cache, self.recency = store, user_id, history, day_cache, recency
+        self.generated = {}   # 日期 -> 当天已生成次数 (重新生成时换下一个种子)
+        self.menu = empty_menu()
+        self.shopping = ShoppingList(self.profile['fridge_items'])
+        self.week_plan = None
+
+    def save_profile(self):
+        if self.store is not None: self.store.save(self.user_id, self.profile)
+
+    def has_menu(self): return bool(self.menu['breakfast'])
+
+    def penalties(self, date=None): return self.recency.penalties(date) if self.recency is not None else None
+
+    # ---- 选菜 ----
+    def pick(self, pool_key, exclude_names=(), prefer_type=None):
+        rng = self.rng
+        if rng is None: rng = random.Random(derive_seed(self.swap_seed, self.swaps)); self.swaps += 1
+        return pick_dish(self.index, pool_key, self.profile, rng, exclude_names, prefer_type, penalties=self.penalties())
+
+    def next_seed(self, kind="day", date=None):
+        """(用户, 日期, 类型, 第几次) -> 种子，并把次数 +1"""
+        date = (date or datetime.date.today()).isoformat()
+        n = self.generated.get((kind, date), 0); self.generated[(kind, date)] = n + 1
+        return derive_seed(self.user_id or "", date, kind, n)
+
+    @perf.timed("menu.generate")
+    def generate(self, solver=False, seed=None, date=None):
+        """生成一天菜单；solver=True 走整体求解。同一 seed + 同一档案命中 day_cache 时直接复用"""
+        if seed is None: seed = self.next_seed("day", date)
+        penalties = self.penalties(date)
+        key = cache_key(seed, self.profile, self.index, solver, penalties.key if penalties else "") if self.day_cache is not None else None
+        menu = self.day_cache.get(key, self.index) if key else None
+        if menu is not None: perf.count("day_cache.hit")
+        else:
+            if solver: menu = solve_day(self.profile, seed=seed, index=self.index, penalties=penalties)
+            else: menu = plan_day(self.index, self.profile, random.Random(seed), penalties=penalties)
+            if key: self.day_cache.put(key, menu)
+        self.rng, self.swap_seed, self.swaps = None, derive_seed(seed, "swap"), 0   # 之后的换菜也可复现，和是否命中缓存无关
+        self.menu.update(menu)
+        self.refresh_shopping()
+        return self.menu
+
+    @perf.timed("menu.swap")
+    def swap(self, slot):
+        """换掉一个菜格 (不会换回同一道)；换成功返回新菜"""
+        curr = self.menu[slot]
+        new_d = self.pick(SLOT_POOLS[slot], [curr['name']] if curr else [])
+        if new_d: self.menu[slot] = new_d; self.refresh_shopping(slot)
+        return new_d
+
+    @perf.timed("menu.plan_week")
+    def plan_week(self, days=7, solver=False, seed=None):
+        if seed is None: seed = self.next_seed("week")
+        plan = solve_menus if solver else plan_menus
+        self.week_plan = plan(self.profile, days=days, seed=seed, index=self.index, penalties=self.penalties())
+        return self.week_plan
+
+    # ---- 缺货清单 / 冰箱 ----
+    @perf.timed("shopping.refresh")
+    def refresh_shopping(self, slot=None):
+        """slot 给定时只增量更新这一格；否则按当前冰箱整体重算"""
+        if slot: self.shopping.set_slot(slot, self.menu[slot])
+        else:
+            self.shopping.set_fridge(self.profile['fridge_items'])
+            self.shopping.set_menu(self.menu, MENU_SLOTS)
+
+    def set_fridge(self, items):
+        self.profile['fridge_items'] = list(dict.fromkeys(items))
+        self.save_profile(); self.refresh_shopping()
+
+    def add_fridge_items(self, items):
+        cur = self.profile['fridge_items']
+        added = [x for x in dict.fromkeys(items) if x not in cur]
+        if added: self.set_fridge(cur + added)
+        return added
+
+    def restock(self):
+        """把缺货清单全部入库，返回新入库的食材"""
+        return self.add_fridge_items(self.shopping.names())
+
+    # ---- 口味反馈 ----
+    def toggle_feedback(self, dish_name, action):
+        """action: 'like' / 'dislike'；再点一次取消，喜欢和不喜欢互斥"""
+        likes, dislikes = self.profile['likes'], self.profile['dislikes']
+        on, off = (likes, dislikes) if action == 'like' else (dislikes, likes)
+        if dish_name in on: on.remove(dish_name)
+        else:
+            on.append(dish_name)
+            if dish_name in off: off.remove(dish_name)
+        self.save_profile()
+
+    # ---- 历史 ----
+    def save_to_history(self, date=None):
+        item = history_item(self.menu, date, self.user_id)
+        if self.history is not None: self.history.append(item)
+        if self.recency is not None: self.recency.add(item)   # 增量更新，不用重读历史
+        return item
+
+    def recent_history(self, limit=10, offset=0):
+        """这个用户自己的收藏 (没有 user_id 时是全部)"""
+        return self.history.recent(limit, offset, user=self.user_id) if self.history is not None else []
+
+
+def menu_names(menu):
+    return {k: (v['name'] if v is not None and not isinstance(v, str) else v) for k, v in menu.items()}
+
+def main(argv=None):
+    """命令行：python kitchen_engine.py --user default --days 7 --solver"""
+    from history_store import open_history_store
+    from profile_store import DEFAULT_USER, open_profile_store
+    from recency import RecencyIndex
+    ap = argparse.ArgumentParser(description="生成菜单 (不启动界面)")
+    ap.add_argument("--user", default=DEFAULT_USER)
+    ap.add_argument("--days", type=int, default=1)
+    ap.add_argument("--seed", type=int)
+    ap.add_argument("--solver", action="store_true")
+    args = ap.parse_args(argv)
+    store = open_profile_store(delay=0)
+    profile = default_profile(); profile.update(store.load(args.user) or {})
+    session = MenuSession(profile, user_id=args.user, recency=RecencyIndex.from_history(open_history_store(), user_id=args.user))
+    if args.days == 1:
+        session.generate(args.solver, args.seed)
+        out = {"menu": menu_names(session.menu), "shopping_list": session.shopping.names()}
+    else:
+        plan = session.plan_week(args.days, args.solver, args.seed)
+        out = {"days": [{"date": d["date"], "menu": menu_names(d["menu"])} for d in plan["days"]], "shopping_list": plan["shopping_list"]}
+    print(json.dumps(out, ensure_ascii=False, indent=2))
+
+if __name__ == "__main__":
+    main()
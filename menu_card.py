@@ -0,0 +1,75 @@
+# menu_card.py
+# 菜单卡片图片生成 (不依赖 Streamlit，下载按钮在后台线程里调用)
+import io
+from functools import lru_cache
+from PIL import Image, ImageDraw
+from fonts import font_path, get_pil_font
+import perf
+
+CARD_CACHE_SIZE = 32
+CARD_SLOTS = ("breakfast", "lunch_meat", "lunch_veg", "lunch_soup", "dinner_meat", "dinner_veg", "dinner_soup")
+CARD_FONT_SIZES = (60, 40, 30, 24)
+POSTER_SIZE = (1240, 1754)   # A4 竖版 @150dpi，直接存 PDF 就能打印
+POSTER_FONT_SIZES = (56, 32, 24, 20)
+
+def create_menu_card_image(menu, nickname):
+    width, height = 800, 1200
+    img = Image.new('RGB', (width, height), color='#FFFDF5')
+    draw = ImageDraw.Draw(img)
+    title_font, header_font, text_font, small_font = (get_pil_font(s) for s in CARD_FONT_SIZES)
+    draw.rectangle([30, 30, 770, 1170], outline="#D4AF37", width=3)
+    draw.text((400, 100), f"{nickname} 的今日食谱", font=title_font, fill='#FF9F1C', anchor="mm")
+    y = 220
+    def draw_section(title, dishes):
+        nonlocal y
+        draw.text((400, y), f"— {title} —", font=header_font, fill='#333', anchor="mm")
+        y += 60
+        for dish in dishes:
+            draw.text((400, y), dish, font=text_font, fill='#555', anchor="mm")
+            y += 50
+        y += 40
+    draw_section("早餐", [menu['breakfast']['name'], "🥛 热牛奶"])
+    draw_section("午餐", [menu['lunch_meat']['name'], menu['lunch_veg']['name'], menu['lunch_soup']['name']])
+    draw_section("晚餐", [menu['dinner_meat']['name'], menu['dinner_veg']['name'], menu['dinner_soup']['name']])
+    draw.text((400, y+30), f"🍎 加餐：{menu['fruit']}", font=text_font, fill='#555', anchor="mm")
+    draw.text((400, height-50), "Generated by Bluey", font=small_font, fill='#CCC', anchor="mm")
+    return img
+
+def _dish_name(d): return d if isinstance(d, str) else (d['name'] if d else "")
+
+def create_week_poster_image(days, nickname):
+    """一周海报：days 为 [{"date", "menu"}] (菜可以是菜名或菜)，每天一栏 早 / 午 / 晚"""
+    width, height = POSTER_SIZE
+    img = Image.new('RGB', POSTER_SIZE, color='#FFFDF5')
+    draw = ImageDraw.Draw(img)
+    title_font, day_font, text_font, small_font = (get_pil_font(s) for s in POSTER_FONT_SIZES)
+    draw.rectangle([30, 30, width - 30, height - 30], outline="#D4AF37", width=3)
+    draw.text((width // 2, 110), f"{nickname} 的一周食谱", font=title_font, fill='#FF9F1C', anchor="mm")
+    top, bottom = 190, height - 90
+    row = (bottom - top) / max(len(days), 1)
+    for i, day in enumerate(days):
+        y, m = top + i * row, day['menu']
+        names = lambda slots: "、".join(n for n in (_dish_name(m.get(s)) for s in slots) if n)
+        draw.rounded_rectangle([60, y + 8, width - 60, y + row - 8], radius=18, fill='#FFFFFF', outline='#F0E6CC', width=2)
+        draw.text((90, y + 22), f"📅 {day['date']}", font=day_font, fill='#333')
+        for j, (label, slots) in enumerate((("早", CARD_SLOTS[:1]), ("午", CARD_SLOTS[1:4]), ("晚", CARD_SLOTS[4:]))):
+            draw.text((110, y + 72 + j * 36), f"{label}  {names(slots)}", font=text_font, fill='#555')
+    draw.text((width // 2, height - 55), "Generated by Bluey", font=small_font, fill='#CCC', anchor="mm")
+    return img
+
+def menu_card_key(menu, nickname):
+    """缓存键：7 道菜名 + 水果 + 昵称 (全是字符串，可哈希)"""
+    names = tuple(menu[k]['name'] if menu.get(k) else "" for k in CARD_SLOTS)
+    return names, menu.get('fruit') or "", nickname
+
+@perf.timed("card.request")
+def render_menu_card_png(names, fruit, nickname):
+    """渲染并编码 PNG；同一份菜单 + 昵称 (+ 当前字体) 只画一次"""
+    return _render_png(names, fruit, nickname, font_path())
+
+@lru_cache(maxsize=CARD_CACHE_SIZE)
+@perf.timed("card.render")
+def _render_png(names, fruit, nickname, font):
+    menu = {k: {"name": n} for k, n in zip(CARD_SLOTS, names)}; menu['fruit'] = fruit
+    buf = io.BytesIO(); create_menu_card_image(menu, nickname).save(buf, format="PNG")
+    return buf.getvalue()
@@ -0,0 +1,283 @@
+# menu_engine.py
+# 选菜引擎：预编译食材索引 + 加权抽样 + 多日计划 (不依赖 Streamlit，可单独导入)
+import datetime
+import hashlib
+import random
+import threading
+from bisect import bisect_right
+from collections import OrderedDict, deque
+from functools import lru_cache
+from itertools import accumulate
+from normalizer import exact_ingredient, expand_allergens, normalize_ingredient
+import perf
+
+RED_MEAT = ["牛肉", "猪肉", "排骨", "羊肉", "猪肝"]
+
+# 晚餐菜池为空时回落到午餐菜池
+POOL_FALLBACK = {"dinner_meat": "lunch_meat", "dinner_veg": "lunch_veg"}
+
+# 打分规则：基础 10，有货 +50，喜欢 +100，符合营养目标 +30，不喜欢直接置 1
+SCORE_BASE, SCORE_IN_STOCK, SCORE_LIKED, SCORE_DISLIKED = 10, 50, 100, 1
+SCORE_GOAL = 30
+SAMPLER_CACHE_SIZE = 256
+TAG_MASK_CACHE_SIZE = 256
+NO_REPEAT_DAYS = 3   # 多日计划里同一道菜至少隔这么多天
+
+# 一天的菜单格子 -> 对应菜池
+DAY_SLOTS = (("breakfast", "breakfast"), ("lunch_meat", "lunch_meat"), ("lunch_veg", "lunch_veg"), ("lunch_soup", "soup"),
+             ("dinner_meat", "dinner_meat"), ("dinner_veg", "dinner_veg"), ("dinner_soup", "soup"))
+
+def derive_seed(*parts):
+    """(用户, 日期, 第几次生成, ...) -> 稳定的 64 位种子；跨进程、跨 Python 版本一致"""
+    raw = "|".join(str(p) for p in parts).encode("utf-8")
+    return int.from_bytes(hashlib.sha256(raw).digest()[:8], "big")
+
+def iter_bits(mask):
+    """按从低到高依次给出位图中为 1 的位序号"""
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+def dish_score(name, in_stock, likes, dislikes, goal=False):
+    score = SCORE_BASE
+    if in_stock: score += SCORE_IN_STOCK
+    if name in likes: score += SCORE_LIKED
+    if goal: score += SCORE_GOAL
+    if name in dislikes: score = SCORE_DISLIKED
+    return score
+
+
+class WeightedSampler:
+    """累积权重数组 + 二分查找：每次抽样 O(log n)，内存 O(n)"""
+    __slots__ = ("items", "cum", "total")
+
+    def __init__(self, items, weights):
+        self.items = items
+        self.cum = list(accumulate(weights))
+        self.total = self.cum[-1] if self.cum else 0
+
+    def __len__(self): return len(self.items)
+
+    def pick(self, rng=random):
+        if not self.items: return None
+        # random() * total 在浮点舍入下可能恰好等于 total，夹一下下标
+        i = bisect_right(self.cum, rng.random() * self.total)
+        return self.items[min(i, len(self.items) - 1)]
+
+
+class PoolIndex:
+    """单个菜池：每道菜的食材位图 + 食材→菜品倒排位图"""
+
+    def __init__(self, dishes, ing_bit, red_bits):
+        self.dishes = dishes
+        self.names = {d['name']: i for i, d in enumerate(dishes)}
+        self.rids = {d['id']: i for i, d in enumerate(dishes) if d.get('id') is not None}   # 菜谱 id -> 池内序号
+        self.ing_masks = []     # 第 i 道菜的 (归一化) 食材位图
+        self.inverted = {}      # 食材位序号 -> 含该食材的菜品位图
+        self.ing_union = 0      # 本池出现过的全部食材
+        self.red_mask = 0       # 含红肉的菜品
+        for i, d in enumerate(dishes):
+            m = 0
+            for ing in d['ingredients']: m |= ing_bit(normalize_ingredient(ing))
+            self.ing_masks.append(m)
+            self.ing_union |= m
+            for b in iter_bits(m): self.inverted[b] = self.inverted.get(b, 0) | (1 << i)
+            if m & red_bits: self.red_mask |= 1 << i
+        self.all_mask = (1 << len(dishes)) - 1
+
+    def dishes_with(self, ing_mask):
+        """含有 ing_mask 中任一食材的菜品位图"""
+        out = 0
+        for b in iter_bits(ing_mask & self.ing_union): out |= self.inverted[b]
+        return out
+
+    def local_mask(self, rid_mask):
+        """按菜谱 id 的位图 (recipe_query) -> 本池菜品位图"""
+        out = 0
+        for rid in iter_bits(rid_mask):
+            i = self.rids.get(rid)
+            if i is not None: out |= 1 << i
+        return out
+
+
+class RecipeIndex:
+    """由 RECIPES_DB 一次性构建；过敏原 / 红肉 / 缺货判断全部变成位运算"""
+
+    def __init__(self, db, tags=None):
+        self.ing_ids = {}   # 归一化食材 -> 位序号
+        self.tags = tags    # recipe_query.TagIndex，可选 (营养目标加分 / 条件筛选)
+        self.red_bits = 0
+        for name in RED_MEAT: self.red_bits |= self._bit(normalize_ingredient(name))
+        self.pools = {}
+        self.fruit = list(db.get('fruit', []))
+        self._samplers = OrderedDict()   # (菜池, 冰箱, 过敏原, 排除, 偏好, 喜欢, 不喜欢) -> WeightedSampler
+        self._lock = threading.Lock()
+        self._fingerprint = None
+        self.tag_masks = lru_cache(maxsize=TAG_MASK_CACHE_SIZE)(self._tag_masks)
+        for key, dishes in db.items():
+            if dishes and not isinstance(dishes[0], str):   # 水果池是字符串
+                self.pools[key] = PoolIndex(dishes, self._bit, self.red_bits)
+
+    def _bit(self, norm_name):
+        if norm_name not in self.ing_ids: self.ing_ids[norm_name] = len(self.ing_ids)
+        return 1 << self.ing_ids[norm_name]
+
+    def mask_of(self, names, normalize=normalize_ingredient):
+        """食材名列表 -> 位图 (先归一化；索引里没有的食材直接忽略)"""
+        m = 0
+        for n in names:
+            i = self.ing_ids.get(normalize(n))
+            if i is not None: m |= 1 << i
+        return m
+
+    def fingerprint(self):
+        """菜谱库指纹 (菜池 + 菜名 + 食材 + 水果)；缓存生成结果时用来判断菜谱是否变过"""
+        if self._fingerprint is None:
+            h = hashlib.sha1()
+            for key in sorted(self.pools):
+                for d in self.pools[key].dishes: h.update(f"{key}\t{d['name']}\t{','.join(d['ingredients'])}\n".encode("utf-8"))
+            h.update("\n".join(self.fruit).encode("utf-8"))
+            self._fingerprint = h.hexdigest()
+        return self._fingerprint
+
+    def _tag_masks(self, pool_key, goals=(), query=""):
+        """(菜池, 营养目标, 筛选条件) -> (加分位图, 筛选位图 或 None)；没有标签索引时不加分也不筛"""
+        p = self.pool(pool_key)
+        if self.tags is None or p is None: return 0, None
+        boost = 0
+        for g in goals: boost |= self.tags.term_mask(g)
+        return p.local_mask(boost), (p.local_mask(self.tags.query(query)) if query else None)
+
+    def is_red_meat(self, ingredients): return bool(self.mask_of(ingredients) & self.red_bits)
+
+    def pool(self, pool_key):
+        p = self.pools.get(pool_key)
+        if (p is None or not p.dishes) and pool_key in POOL_FALLBACK: p = self.pools.get(POOL_FALLBACK[pool_key])
+        return p
+
+    def select(self, pool_key, fridge_mask, allergen_mask, exclude_names=(), prefer_type=None, require=None):
+        """返回 (菜池, 候选位图, 零缺货位图)；require 为筛选位图，筛完没菜可选时忽略"""
+        p = self.pool(pool_key)
+        if p is None: return None, 0, 0
+        cand = p.all_mask & ~p.dishes_with(allergen_mask)
+        if require is not None and cand & require: cand &= require
+        for n in exclude_names:
+            i = p.names.get(n)
+            if i is not None: cand &= ~(1 << i)
+        if prefer_type == "white_meat": cand &= ~p.red_mask
+        if not cand: return p, 0, 0
+        tier0 = cand & ~p.dishes_with(p.ing_union & ~fridge_mask)
+        return p, cand, tier0
+
+    def sampler(self, pool_key, fridge_mask, allergen_mask, exclude_names=(), prefer_type=None, likes=(), dislikes=(), goals=(), dish_filter="", penalties=None):
+        """按当前档案构建 (或复用) 加权抽样器；同样的输入直接命中 LRU
+
+        penalties: recency.Penalties (菜名 -> 权重倍数)，最近吃过的菜降权；按它的 key 区分缓存。
+        """
+        key = (pool_key, fridge_mask, allergen_mask, tuple(exclude_names), prefer_type, frozenset(likes), frozenset(dislikes), tuple(goals), dish_filter,
+               penalties.key if penalties else "")
+        with self._lock:
+            s = self._samplers.get(key)
+            if s is not None:
+                self._samplers.move_to_end(key)
+                perf.count("sampler.hit")
+                return s
+        perf.count("sampler.miss")
+        with perf.span("menu.score"):
+            boost, require = self.tag_masks(pool_key, key[7], dish_filter)
+            p, cand, tier0 = self.select(pool_key, fridge_mask, allergen_mask, exclude_names, prefer_type, require)
+            final = tier0 or cand
+            bits = list(iter_bits(final))
+            weights = [dish_score(p.dishes[i]['name'], bool(tier0), key[5], key[6], boost >> i & 1) for i in bits]
+            if penalties: weights = [w * penalties.get(p.dishes[i]['name'], 1.0) for w, i in zip(weights, bits)]
+            s = WeightedSampler([p.dishes[i] for i in bits], weights)
+        with self._lock:
+            self._samplers[key] = s
+            if len(self._samplers) > SAMPLER_CACHE_SIZE: self._samplers.popitem(last=False)
+        return s
+
+
+@lru_cache(maxsize=None)
+def default_index():
+    """基于 recipe_data.RECIPES_DB 的进程级索引"""
+    from recipe_data import RECIPES_DB
+    from recipe_query import default_tag_index
+    return RecipeIndex(RECIPES_DB, default_tag_index())
+
+def profile_masks(index, profile):
+    """档案 -> (冰箱位图, 过敏原位图)，同一档案多次选菜时算一次就行；过敏原按 ALLERGEN_GROUPS 展开后精确匹配"""
+    return index.mask_of(profile.get('fridge_items', [])), index.mask_of(expand_allergens(profile.get('allergens')), exact_ingredient)
+
+def pick_dish(index, pool_key, profile, rng=random, exclude_names=(), prefer_type=None, masks=None, penalties=None):
+    """按档案 (冰箱/过敏原/喜好/营养目标/筛选条件) 加权抽一道菜，最近吃过的降权；没有可选的返回 None"""
+    fridge_mask, allergen_mask = masks or profile_masks(index, profile)
+    sampler = index.sampler(pool_key, fridge_mask, allergen_mask, exclude_names, prefer_type, profile.get('likes', ()), profile.get('dislikes', ()),
+                            profile.get('nutrition_goals', ()), profile.get('dish_filter', ""), penalties)
+    return sampler.pick(rng)
+
+def _pick_relaxed(index, pool_key, profile, rng, masks, exclude, recent, prefer=None, penalties=None):
+    """先避开最近吃过的 + 偏好，选不出来再逐步放宽"""
+    prefs = (prefer, None) if prefer else (None,)
+    attempts = [(names, pref) for pref in prefs for names in ((exclude + recent, exclude) if recent else (exclude,))]
+    for names, pref in attempts:
+        d = pick_dish(index, pool_key, profile, rng, names, pref, masks, penalties)
+        if d: return d
+    return None
+
+def plan_day(index, profile, rng=random, recent=(), masks=None, prev_dinner_red=False, penalties=None):
+    """一天的菜单 (规则同页面上的"生成今日菜单")
+
+    recent: 最近几天吃过的菜名，尽量避开；prev_dinner_red: 前一天晚餐是红肉时午餐优先白肉；
+    penalties: 历史收藏里最近吃过的菜的降权 (recency.RecencyIndex.penalties())。
+    """
+    masks = masks or profile_masks(index, profile)
+    recent = tuple(recent)
+    pick = lambda pool_key, exclude=(), prefer=None: _pick_relaxed(index, pool_key, profile, rng, masks, tuple(exclude), recent, prefer, penalties)
+    menu = {}
+    menu['breakfast'] = pick('breakfast')
+    menu['lunch_meat'] = pick('lunch_meat', prefer="white_meat" if prev_dinner_red else None)
+    menu['lunch_veg'] = pick('lunch_veg')
+    menu['lunch_soup'] = pick('soup')
+    lunch_meat = menu['lunch_meat']
+    is_red = bool(lunch_meat) and index.is_red_meat(lunch_meat['ingredients'])
+    menu['dinner_meat'] = pick('dinner_meat', [lunch_meat['name']] if lunch_meat else [], "white_meat" if is_red else None)
+    menu['dinner_veg'] = pick('dinner_veg')
+    menu['dinner_soup'] = pick('soup', [menu['lunch_soup']['name']] if menu['lunch_soup'] else [])
+    menu['fruit'] = rng.choice(index.fruit) if index.fruit else None
+    return menu
+
+def menu_dishes(menu):
+    return [menu[slot] for slot, _ in DAY_SLOTS if menu.get(slot)]
+
+def consolidated_shopping_list(profile, menus):
+    """多天菜单合并成一张采购单：归一化食材 -> 需要它的菜数 (按首次出现排序)"""
+    fridge = {normalize_ingredient(i) for i in profile.get('fridge_items', [])}
+    needed = {}
+    for menu in menus:
+        for d in menu_dishes(menu):
+            for ing in d['ingredients']:
+                n = normalize_ingredient(ing)
+                if n not in fridge: needed[n] = needed.get(n, 0) + 1
+    return needed
+
+def plan_menus(profile, days=7, seed=None, index=None, no_repeat_days=NO_REPEAT_DAYS, start=None, penalties=None):
+    """一次生成 N 天菜单 + 一张合并采购单；同样的 seed 结果相同
+
+    同一道菜 no_repeat_days 天内不重复 (选不出来时放宽)，午晚餐红白肉交替，并延续到第二天午餐。
+    """
+    index = index or default_index()
+    rng = random.Random(seed)
+    masks = profile_masks(index, profile)
+    start = start or datetime.date.today()
+    served = deque(maxlen=no_repeat_days)   # 每天吃过的菜名
+    plan, prev_red = [], False
+    for i in range(days):
+        recent = tuple(n for names in served for n in names)
+        menu = plan_day(index, profile, rng, recent, masks, prev_red, penalties)
+        served.append([d['name'] for d in menu_dishes(menu)])
+        dm = menu['dinner_meat']
+        prev_red = bool(dm) and index.is_red_meat(dm['ingredients'])
+        plan.append({"date": (start + datetime.timedelta(days=i)).isoformat(), "menu": menu})
+    return {"days": plan, "shopping_list": consolidated_shopping_list(profile, [d["menu"] for d in plan])}
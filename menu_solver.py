@@ -0,0 +1,192 @@
+# menu_solver.py
+# 求解模式：把一天 (或一周) 的所有菜格当成一个整体分配问题，在时间预算内找最优搭配
+# 目标：冰箱覆盖率高、偏向喜欢的菜、采购单尽量短；过敏原 / 同餐不重复是硬约束，红白肉交替是软约束
+import datetime
+import random
+import time
+from menu_engine import DAY_SLOTS, NO_REPEAT_DAYS, consolidated_shopping_list, default_index, iter_bits, profile_masks
+
+# 目标函数权重 (越大越好)
+W_COVER = 3.0       # 食材在冰箱里的比例
+W_IN_STOCK = 1.0    # 完全不缺货额外加分
+W_LIKED = 2.0
+W_DISLIKED = -3.0
+W_GOAL = 1.0        # 符合营养目标
+W_SHOP = -1.0       # 采购单上每多一样食材
+W_RED_RED = -4.0    # 同一天午晚餐都是红肉
+W_REPEAT = -6.0     # no_repeat_days 天内重复
+W_RECENT = -4.0     # 历史收藏里最近吃过 (乘以降权幅度 1 - 倍数)
+W_CONFLICT = -1000.0  # 同一天午晚餐同一道菜 / 同一道汤
+MAX_RESTARTS = 12
+MAX_SWEEPS = 50     # 每轮下降最多扫几遍 (通常十遍内就收敛)
+# 一次求解最多试多少个候选 (所有轮加起来)：菜谱库越大每遍越贵，按次数封顶才能既可复现又有延迟上限
+# 实测 (benchmarks/bench_menu.py 的合成库，40 样冰箱 + 50 个喜好)：
+#   1x 一天 / 一周、10x 一天都跑不满 (约 3k / 24k / 36k 次)，结果和不封顶一样
+#   封顶后最慢 (三个 seed 取最慢)：10x 0.55 s，100x 0.6 s，1000x 1.6 s (一天和一周差不多)
+#   1000x 时大半是建候选表 (扫一遍菜池，约 1.2 s)，这部分随菜谱库线性增长，搜索本身不再增长
+MAX_EVALS = 60000
+
+
+class _Problem:
+    """菜格 = (第几天, 格子名, 菜池)；候选 = 菜池里过敏原安全的菜"""
+
+    def __init__(self, index, profile, days, no_repeat_days, penalties=None):
+        self.index = index
+        self.profile, self.penalties = profile, penalties
+        self.fridge_mask, self.allergen_mask = profile_masks(index, profile)
+        self.slots, self.cands, self.unary = [], [], []
+        built = {}   # 候选和单项得分只和菜池有关，多天共用一份
+        for day in range(days):
+            for slot, pool_key in DAY_SLOTS:
+                if pool_key not in built: built[pool_key] = self._pool(pool_key)
+                options, scores = built[pool_key]
+                self.slots.append((day, slot, pool_key))
+                self.cands.append(options); self.unary.append(scores)
+        # 和每个菜格有关系的其他菜格 (同一天 / 同菜池 no_repeat_days 天内)
+        self.related = [[t for t, (d2, _, p2) in enumerate(self.slots)
+                         if t != s and (d2 == d1 or (p2 == p1 and abs(d2 - d1) <= no_repeat_days))]
+                        for s, (d1, _, p1) in enumerate(self.slots)]
+
+    def _pool(self, pool_key):
+        """一个菜池的候选 (菜, 缺货掩码, 是否红肉) 和单项得分"""
+        index, profile, penalties = self.index, self.profile, self.penalties
+        fridge_mask, allergen_mask = self.fridge_mask, self.allergen_mask
+        likes, dislikes = set(profile.get('likes', ())), set(profile.get('dislikes', ()))
+        goals, dish_filter = tuple(profile.get('nutrition_goals', ())), profile.get('dish_filter', "")
+        boost, require = index.tag_masks(pool_key, goals, dish_filter)
+        p, cand, _ = index.select(pool_key, fridge_mask, allergen_mask, require=require)
+        options, scores = [], []
+        for i in iter_bits(cand):
+            d, m = p.dishes[i], p.ing_masks[i]
+            total = bin(m).count("1") or 1
+            miss = m & ~fridge_mask
+            s = W_COVER * (total - bin(miss).count("1")) / total
+            if not miss: s += W_IN_STOCK
+            if d['name'] in likes: s += W_LIKED
+            if d['name'] in dislikes: s += W_DISLIKED
+            if boost >> i & 1: s += W_GOAL
+            if penalties: s += W_RECENT * (1 - penalties.get(d['name'], 1.0))
+            options.append((d, miss, bool(m & index.red_bits)))
+            scores.append(s)
+        return options, scores
+
+    def pair(self, s, a, t, b):
+        """菜格 s 选 a、菜格 t 选 b 时的成对得分"""
+        (d1, slot1, _), (d2, slot2, _) = self.slots[s], self.slots[t]
+        da, db = self.cands[s][a][0], self.cands[t][b][0]
+        if d1 == d2:
+            kinds = {slot1, slot2}
+            if da is db and (kinds == {'lunch_meat', 'dinner_meat'} or kinds == {'lunch_soup', 'dinner_soup'}): return W_CONFLICT
+            if kinds == {'lunch_meat', 'dinner_meat'} and self.cands[s][a][2] and self.cands[t][b][2]: return W_RED_RED
+            return 0.0
+        return W_REPEAT if da is db else 0.0
+
+
+class _State:
+    """当前分配 + 增量打分 (采购单按缺货食材计数维护)"""
+
+    def __init__(self, prob, assign):
+        self.prob, self.assign = prob, list(assign)
+        self.shop = {}
+        for s, a in enumerate(self.assign):
+            if a is not None: self._add_shop(self.prob.cands[s][a][1])
+        self.score = self._full_score()
+
+    def _add_shop(self, miss):
+        for b in iter_bits(miss): self.shop[b] = self.shop.get(b, 0) + 1
+
+    def _remove_shop(self, miss):
+        for b in iter_bits(miss):
+            self.shop[b] -= 1
+            if not self.shop[b]: del self.shop[b]
+
+    def _full_score(self):
+        p, total = self.prob, W_SHOP * len(self.shop)
+        for s, a in enumerate(self.assign):
+            if a is None: continue
+            total += p.unary[s][a]
+            for t in p.related[s]:
+                if t > s and self.assign[t] is not None: total += p.pair(s, a, t, self.assign[t])
+        return total
+
+    def delta(self, s, b):
+        """菜格 s 从当前候选换到 b 的得分变化"""
+        p, a = self.prob, self.assign[s]
+        if a == b: return 0.0
+        d = p.unary[s][b] - (p.unary[s][a] if a is not None else 0.0)
+        for t in p.related[s]:
+            c = self.assign[t]
+            if c is None: continue
+            d += p.pair(s, b, t, c) - (p.pair(s, a, t, c) if a is not None else 0.0)
+        old_miss = p.cands[s][a][1] if a is not None else 0
+        new_miss = p.cands[s][b][1]
+        for bit in iter_bits(old_miss & ~new_miss):
+            if self.shop[bit] == 1: d -= W_SHOP   # 这样食材不用买了
+        for bit in iter_bits(new_miss & ~old_miss):
+            if bit not in self.shop: d += W_SHOP
+        return d
+
+    def move(self, s, b, d):
+        a = self.assign[s]
+        if a is not None: self._remove_shop(self.prob.cands[s][a][1])
+        self._add_shop(self.prob.cands[s][b][1])
+        self.assign[s] = b; self.score += d
+
+
+def _timed_out(deadline): return deadline is not None and time.perf_counter() >= deadline
+
+def _descend(state, rng, deadline=None, max_evals=None):
+    """逐格换成最优候选 (平分时随机)，直到没有改进、扫满 MAX_SWEEPS 遍、试满 max_evals 个候选或超时"""
+    improved, state.evals = True, 0
+    order = list(range(len(state.assign)))
+    for _ in range(MAX_SWEEPS):
+        if not improved or _timed_out(deadline): break
+        improved = False
+        rng.shuffle(order)
+        for s in order:
+            n = len(state.prob.cands[s])
+            if not n: continue
+            if max_evals is not None and state.evals >= max_evals: return state
+            state.evals += n
+            best, best_d = [], 0.0
+            for b in range(n):
+                d = state.delta(s, b)
+                if d <= 1e-9: continue   # 只接受严格改进，避免原地打转
+                if d > best_d + 1e-9: best, best_d = [b], d
+                elif abs(d - best_d) <= 1e-9: best.append(b)
+            if best:
+                state.move(s, rng.choice(best), best_d); improved = True
+    return state
+
+
+def solve_menus(profile, days=1, seed=None, time_budget=None, index=None, no_repeat_days=NO_REPEAT_DAYS, max_restarts=MAX_RESTARTS, penalties=None, start=None, max_evals=MAX_EVALS):
+    """求解 N 天菜单 (从 start 开始，默认今天)；返回结构同 plan_menus
+
+    按次数停：max_restarts 轮，每轮最多 MAX_SWEEPS 遍，所有轮合计最多试 max_evals 个候选，
+    所以同一 seed 在任何机器上结果都一样，延迟也随菜谱库大小封顶。
+    给了 time_budget (秒) 时超时也会停，取当时的最好解，这时结果和机器快慢有关。
+    """
+    index = index or default_index()
+    rng = random.Random(seed)
+    prob = _Problem(index, profile, days, no_repeat_days, penalties)
+    deadline = time.perf_counter() + time_budget if time_budget is not None else None
+    best, left = None, max_evals
+    for _ in range(max_restarts):
+        assign = [rng.randrange(len(c)) if c else None for c in prob.cands]
+        state = _descend(_State(prob, assign), rng, deadline, left)
+        if best is None or state.score > best.score + 1e-9: best = state
+        if left is not None: left -= state.evals
+        if _timed_out(deadline) or (left is not None and left <= 0): break
+    plan = []
+    start = start or datetime.date.today()
+    for day in range(days):
+        menu = {}
+        for s, (d, slot, _) in enumerate(prob.slots):
+            if d == day: menu[slot] = prob.cands[s][best.assign[s]][0] if best.assign[s] is not None else None
+        menu['fruit'] = rng.choice(index.fruit) if index.fruit else None
+        plan.append({"date": (start + datetime.timedelta(days=day)).isoformat(), "menu": menu})
+    return {"days": plan, "shopping_list": consolidated_shopping_list(profile, [d["menu"] for d in plan]), "score": best.score}
+
+def solve_day(profile, seed=None, time_budget=None, index=None, penalties=None):
+    """求解一天菜单 (与 plan_day 返回同样的格子字典)"""
+    return solve_menus(profile, 1, seed, time_budget, index, penalties=penalties)["days"][0]["menu"]
@@ -0,0 +1,153 @@
+# normalizer.py
+# 食材归一化：同义词表 + 冰箱分类 + 菜谱食材编译成一个 Aho-Corasick 自动机
+# 能认出 "两个番茄" -> 西红柿、"冷冻基围虾" -> 虾仁；认不出时再做一次模糊匹配；结果按进程缓存
+# 调料 / 加工品不归到原料上："玉米油"、"南瓜子"、"番茄酱" 原样保留；过敏原按 ALLERGEN_GROUPS 展开成一组食材
+import difflib
+import re
+from collections import deque
+from functools import lru_cache
+
+SYNONYM_MAP = {"番茄": "西红柿", "洋柿子": "西红柿", "洋芋": "土豆", "马铃薯": "土豆", "大虾": "虾仁", "基围虾": "虾仁", "花菜": "西兰花", "圆白菜": "青菜", "白菜": "青菜", "娃娃菜": "青菜", "牛腩": "牛肉", "肥牛": "牛肉", "肉末": "猪肉", "里脊": "猪肉", "排骨": "猪肉", "鸡腿": "鸡肉", "鸡翅": "鸡肉", "龙利鱼": "鱼", "巴沙鱼": "鱼", "鳕鱼": "鱼"}
+FUZZY_CUTOFF = 0.66
+# 词后面紧跟这些字时是调料，不算这个食材 (玉米油、番茄酱、红薯粉、苹果醋)
+PROCESSED_SUFFIXES = frozenset("油酱粉汁醋膏精酒糖")
+# 子 / 干 / 饼 结尾的大多还是原料 (茄子、鸡肉丸子)，是加工品的逐个列出；这些词自成一个食材，不归到原料上
+PROCESSED_FOODS = ("南瓜子", "西瓜子", "葵花子", "瓜子", "豆腐干", "萝卜干", "笋干", "牛肉干", "猪肉干", "鱼干",
+                   "鸡蛋饼", "南瓜饼", "土豆饼", "玉米饼", "红薯干", "地瓜干")
+# 过敏原 -> 要避开的食材 (写法会先按同义词归一)；不在表里的只认它本身
+_DAIRY = ("牛奶", "奶粉", "奶酪", "酸奶", "黄油", "奶油")
+ALLERGEN_GROUPS = {
+    "虾": ("虾", "虾仁", "大虾", "基围虾", "虾皮", "虾米", "海鲜"),
+    "鱼": ("鱼", "鳕鱼", "三文鱼", "龙利鱼", "巴沙鱼", "鱼干", "海鲜"),
+    "海鲜": ("海鲜", "鳕鱼", "虾仁", "三文鱼", "鱼", "蛤蜊", "干贝", "虾", "海带", "紫菜"),
+    "牛奶": _DAIRY, "奶粉": _DAIRY, "奶制品": _DAIRY,
+    "鸡蛋": ("鸡蛋", "鸡蛋饼", "鹌鹑蛋"),
+    "花生": ("花生", "花生油", "花生酱"),
+    "麦麸": ("面粉", "面条", "面包", "馄饨皮", "饺子皮", "挂面", "小麦", "燕麦"),   # 燕麦常混有麦麸
+}
+NORMALIZE_CACHE_SIZE = 8192
+_ENTRY_SPLIT_RE = re.compile(r"[，,、;；/\s]+")
+
+
+class IngredientNormalizer:
+    """词表 (写法 -> 标准名) 编译成 AC 自动机，一次扫描找出文本里所有食材"""
+
+    def __init__(self, synonyms, vocabulary=(), processed=PROCESSED_FOODS):
+        self.canonical = {}
+        for w in vocabulary:
+            w = w.strip()
+            if w: self.canonical[w] = synonyms.get(w, w)
+        self.canonical.update(synonyms)
+        self.processed = frozenset(processed)
+        self.canonical.update((w, w) for w in self.processed)   # 最长匹配时 "豆腐干" 盖住 "豆腐"
+        self._build(self.canonical)
+        self._fuzzy_pool = sorted(w for w in self.canonical if len(w) > 1)
+
+    def _build(self, words):
+        self.goto, self.fail, self.out = [{}], [0], [0]   # out: 该状态结尾的最长词长
+        for w in words:
+            s = 0
+            for ch in w:
+                if ch not in self.goto[s]:
+                    self.goto.append({}); self.fail.append(0); self.out.append(0)
+                    self.goto[s][ch] = len(self.goto) - 1
+                s = self.goto[s][ch]
+            self.out[s] = max(self.out[s], len(w))
+        self.dict_link = [0] * len(self.goto)   # 沿 fail 链最近的"词结尾"状态
+        q = deque(self.goto[0].values())
+        while q:
+            s = q.popleft()
+            for ch, t in self.goto[s].items():
+                f = self.fail[s]
+                while f and ch not in self.goto[f]: f = self.fail[f]
+                self.fail[t] = self.goto[f].get(ch, 0)
+                ft = self.fail[t]
+                self.dict_link[t] = ft if self.out[ft] else self.dict_link[ft]
+                q.append(t)
+
+    def matches(self, text):
+        """所有命中：[(起点, 长度)]"""
+        found, s = [], 0
+        for i, ch in enumerate(text):
+            while s and ch not in self.goto[s]: s = self.fail[s]
+            s = self.goto[s].get(ch, 0)
+            t = s
+            while t:
+                if self.out[t]: found.append((i + 1 - self.out[t], self.out[t]))
+                t = self.dict_link[t]
+        return found
+
+    def segments(self, text):
+        """最左最长、不重叠地切出食材词；后面紧跟加工品后缀的词 (玉米|油) 丢掉"""
+        out, end = [], 0
+        for start, length in sorted(self.matches(text), key=lambda m: (m[0], -m[1])):
+            if start >= end:
+                end = start + length
+                if text[end:end + 1] not in PROCESSED_SUFFIXES: out.append(text[start:end])
+        return out
+
+    def exact(self, name):
+        """只认精确写法和同义词 (过敏原用)，否则原样"""
+        name = name.strip()
+        return self.canonical.get(name, name)
+
+    def extract(self, text):
+        """'番茄土豆' -> ['西红柿', '土豆']；自由文本里的全部食材 (标准名，去重保序)；加工品不算"""
+        seen = []
+        for w in self.segments(text.strip()):
+            if w in self.processed: continue
+            c = self.canonical[w]
+            if c not in seen: seen.append(c)
+        if not seen and text.strip():
+            n = self.normalize(text)
+            if n != text.strip() and n not in self.processed: seen.append(n)   # 模糊匹配兜底
+        return seen
+
+    def normalize(self, name):
+        """单个食材的标准名：精确 > 自动机 (取最后一个词，中文中心词在后) > 模糊 > 原样；以调料后缀结尾的只认精确"""
+        name = name.strip()
+        if name in self.canonical: return self.canonical[name]
+        if name[-1:] in PROCESSED_SUFFIXES: return name
+        segs = self.segments(name)
+        if segs: return self.canonical[segs[-1]]
+        if len(name) > 1:
+            close = difflib.get_close_matches(name, self._fuzzy_pool, n=1, cutoff=FUZZY_CUTOFF)
+            if close: return self.canonical[close[0]]
+        return name
+
+
+@lru_cache(maxsize=None)
+def default_normalizer():
+    """词表 = 同义词 + 冰箱分类 + 菜谱里出现过的食材"""
+    from recipe_data import RECIPES_DB, FRIDGE_CATEGORIES
+    vocab = [x for items in FRIDGE_CATEGORIES.values() for x in items]
+    vocab += [ing for pool in RECIPES_DB.values() for d in pool if not isinstance(d, str) for ing in d['ingredients']]
+    return IngredientNormalizer(SYNONYM_MAP, vocab)
+
+@lru_cache(maxsize=NORMALIZE_CACHE_SIZE)
+def normalize_ingredient(name): return default_normalizer().normalize(name)
+
+@lru_cache(maxsize=NORMALIZE_CACHE_SIZE)
+def exact_ingredient(name): return default_normalizer().exact(name)
+
+@lru_cache(maxsize=NORMALIZE_CACHE_SIZE)
+def allergen_ingredients(name):
+    """过敏原 -> 要避开的标准食材名 ('虾' -> 虾仁 / 海鲜 ...)；先查原写法再查同义词归一后的写法"""
+    name = name.strip()
+    group = ALLERGEN_GROUPS.get(name) or ALLERGEN_GROUPS.get(exact_ingredient(name), ())
+    return tuple(dict.fromkeys(exact_ingredient(x) for x in (name,) + group))
+
+def expand_allergens(names):
+    return [x for n in names or () for x in allergen_ingredients(n)]
+
+@lru_cache(maxsize=NORMALIZE_CACHE_SIZE)
+def extract_ingredients(text): return tuple(default_normalizer().extract(text))
+
+def parse_fridge_entry(text):
+    """冰箱自由输入 '两个番茄，冷冻基围虾、蜂蜜' -> ['西红柿', '虾仁', '蜂蜜']；认不出的原样保留"""
+    out = []
+    for part in _ENTRY_SPLIT_RE.split(text or ""):
+        if not part: continue
+        for item in extract_ingredients(part) or (part,):
+            if item not in out: out.append(item)
+    return out
@@ -0,0 +1,154 @@
+# perf.py
+# 轻量计时 / 计数：@timed 装饰器、span() 上下文、count() 计数器
+# 默认关闭 (只多一次布尔判断)；YOUYOU_PERF=1 对整个进程打开，页面带 ?perf=1 只对这个会话打开 (begin_rerun 的 session_on)
+# 同时汇总到 进程 / 会话 / 本次 rerun 三级，可导出 Prometheus 文本文件或 JSON 日志
+import contextlib
+import functools
+import json
+import os
+import threading
+import time
+
+PROM_FILE = os.environ.get("YOUYOU_PERF_PROM", "")   # 例如 node_exporter textfile 目录下的 youyou.prom
+LOG_FILE = os.environ.get("YOUYOU_PERF_LOG", "")     # 每次 rerun 追加一行 JSON
+PROM_PREFIX = "youyou"
+
+_enabled = os.environ.get("YOUYOU_PERF", "0") == "1"
+_local = threading.local()   # 当前线程正在收集的 会话 / rerun 统计，以及这个会话是否单独打开了计时
+
+
+class Stats:
+    """op -> [次数, 总秒数, 最大秒数]；counters: 名字 -> 次数"""
+
+    def __init__(self):
+        self.ops, self.counters = {}, {}
+        self._lock = threading.Lock()
+
+    def add(self, op, dt):
+        with self._lock:
+            s = self.ops.get(op)
+            if s is None: self.ops[op] = [1, dt, dt]
+            else: s[0] += 1; s[1] += dt; s[2] = max(s[2], dt)
+
+    def incr(self, name, n=1):
+        with self._lock: self.counters[name] = self.counters.get(name, 0) + n
+
+    def summary(self):
+        with self._lock:
+            ops = {op: {"count": n, "total_ms": t * 1000, "avg_ms": t / n * 1000, "max_ms": m * 1000} for op, (n, t, m) in self.ops.items()}
+            return {"ops": ops, "counters": dict(self.counters)}
+
+    def rows(self):
+        """给界面表格用：按总耗时倒序"""
+        s = self.summary()["ops"]
+        return [dict(op=op, **v) for op, v in sorted(s.items(), key=lambda kv: -kv[1]["total_ms"])]
+
+
+PROCESS = Stats()
+
+def enabled(): return _enabled or getattr(_local, "on", False)
+
+def process_enabled(): return _enabled
+
+def enable(flag=True):
+    """整个进程打开 / 关闭 (运维用；页面上的开关走 begin_rerun 的 session_on)"""
+    global _enabled
+    _enabled = flag
+
+def _targets():
+    return (PROCESS,) + getattr(_local, "scopes", ())
+
+def record(op, dt):
+    for s in _targets(): s.add(op, dt)
+
+def count(name, n=1):
+    if enabled():
+        for s in _targets(): s.incr(name, n)
+
+
+class _Span:
+    __slots__ = ("op", "t")
+
+    def __init__(self, op): self.op = op
+
+    def __enter__(self): self.t = time.perf_counter(); return self
+
+    def __exit__(self, *exc): record(self.op, time.perf_counter() - self.t)
+
+_NOOP = contextlib.nullcontext()
+
+def span(op):
+    """with perf.span("history.recent"): ...  (关闭时返回共享的空上下文)"""
+    return _Span(op) if enabled() else _NOOP
+
+def timed(op=None):
+    """@perf.timed("menu.generate")；不给名字时用 模块.函数名"""
+    def deco(fn):
+        name = op or f"{fn.__module__}.{fn.__qualname__}"
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not enabled(): return fn(*args, **kwargs)
+            t = time.perf_counter()
+            try: return fn(*args, **kwargs)
+            finally: record(name, time.perf_counter() - t)
+        return wrapper
+    return deco
+
+
+# ---- rerun 级汇总 ----
+def begin_rerun(session_stats, session_on=False):
+    """脚本开头调用：本线程之后的计时同时记到 会话 和 新的 rerun 统计里
+
+    session_on 只对当前线程 (= 这个会话的脚本线程，回调和片段重跑也在这个线程) 打开计时，别的会话不受影响。
+    这次 rerun 已经由按钮回调开始了 (begin_callback) 时接着用那份统计，回调的耗时也算在这次 rerun 里。
+    """
+    _local.on = session_on
+    early, _local.early = getattr(_local, "early", None), None
+    if not enabled(): _local.scopes = (); return None
+    if early is session_stats: return _local.scopes[1]
+    rerun = Stats()
+    _local.scopes, _local.rerun_start = (session_stats, rerun), time.perf_counter()
+    return rerun
+
+def begin_callback(session_stats, session_on=False):
+    """按钮回调开头调用：回调比脚本 (或片段) 先跑，在这里先按会话开关打开计时"""
+    if getattr(_local, "early", None) is session_stats: return   # 同一次 rerun 已经开过了
+    begin_rerun(session_stats, session_on)
+    _local.early = session_stats if enabled() else None
+
+def end_rerun(session_id=""):
+    """脚本末尾调用：记下整次 rerun 耗时，按配置导出；返回本次 rerun 的统计"""
+    scopes = getattr(_local, "scopes", ())
+    if not scopes: return None
+    record("rerun", time.perf_counter() - _local.rerun_start)
+    _local.scopes, _local.early = (), None
+    rerun = scopes[1]
+    if LOG_FILE: append_json_log(LOG_FILE, rerun, session_id)
+    if PROM_FILE: write_prometheus(PROM_FILE)
+    return rerun
+
+
+# ---- 导出 ----
+def _label(v): return str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", " ")
+
+def prometheus_text(stats=PROCESS, prefix=PROM_PREFIX):
+    s = stats.summary()
+    lines = [f"# HELP {prefix}_op_seconds 各操作耗时", f"# TYPE {prefix}_op_seconds summary"]
+    for op, v in sorted(s["ops"].items()):
+        lines.append(f'{prefix}_op_seconds_count{{op="{_label(op)}"}} {v["count"]}')
+        lines.append(f'{prefix}_op_seconds_sum{{op="{_label(op)}"}} {v["total_ms"] / 1000:.6f}')
+    lines += [f"# HELP {prefix}_op_seconds_max 各操作最大耗时", f"# TYPE {prefix}_op_seconds_max gauge"]
+    for op, v in sorted(s["ops"].items()): lines.append(f'{prefix}_op_seconds_max{{op="{_label(op)}"}} {v["max_ms"] / 1000:.6f}')
+    lines += [f"# HELP {prefix}_events_total 计数器", f"# TYPE {prefix}_events_total counter"]
+    for name, n in sorted(s["counters"].items()): lines.append(f'{prefix}_events_total{{name="{_label(name)}"}} {n}')
+    return "\n".join(lines) + "\n"
+
+def write_prometheus(path, stats=PROCESS):
+    """原子写 (textfile collector 不会读到半个文件)"""
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f: f.write(prometheus_text(stats))
+    os.replace(tmp, path)
+
+def append_json_log(path, stats, session_id=""):
+    rec = dict(stats.summary(), ts=time.time(), session=session_id)
+    with open(path, "a", encoding="utf-8") as f: f.write(json.dumps(rec, ensure_ascii=False) + "\n")
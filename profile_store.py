@@ -0,0 +1,173 @@
+# profile_store.py
+# 用户档案存储：按用户分文件 (原子写) 或 SQLite；连续点击合并成一次写盘
+import atexit
+import contextlib
+import json
+import os
+import re
+import sqlite3
+import tempfile
+import threading
+import time
+from abc import ABC, abstractmethod
+import perf
+
+LEGACY_FILE = "user_data.json"   # 旧版单文件档案，迁移为 "default" 用户
+PROFILE_DIR = "user_profiles"
+SQLITE_FILE = "user_profiles.db"
+DEFAULT_USER = "default"
+SAVE_DELAY = 1.0   # 秒；这段时间内的多次保存只落盘一次
+_USER_ID_RE = re.compile(r"^[A-Za-z0-9_-]{1,64}$")
+
+def valid_user_id(user_id): return bool(user_id) and bool(_USER_ID_RE.match(user_id))
+
+
+class LatencyStats:
+    """记录读写次数 / 总耗时 / 最大耗时 (秒)"""
+
+    def __init__(self):
+        self.data = {}
+        self._lock = threading.Lock()
+
+    @contextlib.contextmanager
+    def measure(self, op):
+        t = time.perf_counter()
+        try: yield
+        finally:
+            dt = time.perf_counter() - t
+            if perf.enabled(): perf.record(f"profile.{op}", dt)
+            with self._lock:
+                n, total, worst = self.data.get(op, (0, 0.0, 0.0))
+                self.data[op] = (n + 1, total + dt, max(worst, dt))
+
+    def summary(self):
+        with self._lock: data = dict(self.data)
+        return {op: {"count": n, "avg_ms": total / n * 1000, "max_ms": worst * 1000} for op, (n, total, worst) in data.items()}
+
+
+class ProfileStore(ABC):
+    """档案存储接口：load 返回 dict 或 None，save 整体覆盖；漏实现方法的后端在创建时就报错"""
+
+    def __init__(self): self.stats = LatencyStats()
+    @abstractmethod
+    def load(self, user_id): ...
+    @abstractmethod
+    def save(self, user_id, data): ...
+    @abstractmethod
+    def users(self): ...
+
+    def _load_legacy(self, user_id):
+        if user_id != DEFAULT_USER or not os.path.exists(LEGACY_FILE): return None
+        try:
+            with open(LEGACY_FILE, "r", encoding="utf-8") as f: return json.load(f)
+        except: return None
+
+
+class JsonProfileStore(ProfileStore):
+    """每个用户一个 JSON 文件；临时文件 + os.replace，读者永远看不到半个文件"""
+
+    def __init__(self, directory=PROFILE_DIR):
+        super().__init__()
+        self.dir = directory
+        os.makedirs(self.dir, exist_ok=True)
+
+    def _path(self, user_id): return os.path.join(self.dir, f"{user_id}.json")
+
+    def users(self):
+        return sorted(n[:-5] for n in os.listdir(self.dir) if n.endswith(".json") and valid_user_id(n[:-5]))
+
+    def load(self, user_id):
+        with self.stats.measure("load"):
+            try:
+                with open(self._path(user_id), "r", encoding="utf-8") as f: return json.load(f)
+            except FileNotFoundError: return self._load_legacy(user_id)
+            except ValueError: return None
+
+    def save(self, user_id, data):
+        payload = data if isinstance(data, str) else json.dumps(data, ensure_ascii=False, indent=2)
+        with self.stats.measure("save"):
+            fd, tmp = tempfile.mkstemp(prefix=f".{user_id}-", suffix=".tmp", dir=self.dir)
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as f: f.write(payload)
+                os.replace(tmp, self._path(user_id))
+            except:
+                os.unlink(tmp); raise
+
+
+class SqliteProfileStore(ProfileStore):
+    """SQLite 版：一行一个用户，upsert 覆盖"""
+
+    def __init__(self, path=SQLITE_FILE):
+        super().__init__()
+        self.path = path
+        with self._connect() as db, db:
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("CREATE TABLE IF NOT EXISTS profiles (user_id TEXT PRIMARY KEY, data TEXT NOT NULL, updated REAL NOT NULL)")
+
+    def _connect(self): return contextlib.closing(sqlite3.connect(self.path, timeout=10))
+
+    def load(self, user_id):
+        with self.stats.measure("load"):
+            with self._connect() as db:
+                row = db.execute("SELECT data FROM profiles WHERE user_id = ?", (user_id,)).fetchone()
+            return json.loads(row[0]) if row else self._load_legacy(user_id)
+
+    def users(self):
+        with self._connect() as db: return [r[0] for r in db.execute("SELECT user_id FROM profiles ORDER BY user_id")]
+
+    def save(self, user_id, data):
+        payload = data if isinstance(data, str) else json.dumps(data, ensure_ascii=False)
+        with self.stats.measure("save"):
+            with self._connect() as db, db:
+                db.execute("INSERT INTO profiles (user_id, data, updated) VALUES (?, ?, ?) "
+                           "ON CONFLICT(user_id) DO UPDATE SET data = excluded.data, updated = excluded.updated",
+                           (user_id, payload, time.time()))
+
+
+class DebouncedProfileStore:
+    """包一层防抖：save 只记下最新快照，delay 秒后由后台线程统一落盘"""
+
+    def __init__(self, store, delay=SAVE_DELAY):
+        self.store, self.delay = store, delay
+        self.stats = store.stats
+        self._pending = {}   # user_id -> 已序列化的最新快照
+        self._writing = {}   # 正在落盘的那一批 (写完前 load 还要能读到)
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()   # 计时器 / 手动 / 退出时的 flush 排队写，旧快照不会晚于新快照落盘
+        self._timer = None
+        atexit.register(self.flush)
+
+    def load(self, user_id):
+        with self._lock: pending = self._pending.get(user_id, self._writing.get(user_id))
+        return json.loads(pending) if pending is not None else self.store.load(user_id)
+
+    def users(self):
+        with self._lock: pending = set(self._pending)
+        return sorted(pending.union(self.store.users()))
+
+    @perf.timed("profile.snapshot")
+    def save(self, user_id, data):
+        snapshot = json.dumps(data, ensure_ascii=False)   # 立刻拍快照，之后会话怎么改都不影响
+        with self._lock:
+            self._pending[user_id] = snapshot
+            if self._timer is None:
+                self._timer = threading.Timer(self.delay, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def flush(self):
+        with self._flush_lock:
+            with self._lock:
+                pending, self._pending, self._timer = self._pending, {}, None
+                self._writing = pending
+            try:
+                for user_id, snapshot in pending.items(): self.store.save(user_id, snapshot)
+            finally:
+                with self._lock: self._writing = {}
+
+
+def open_profile_store(backend=None, delay=SAVE_DELAY):
+    """按 YOUYOU_PROFILE_BACKEND (json / sqlite) 选后端，默认 json，外面套防抖"""
+    backend = backend or os.environ.get("YOUYOU_PROFILE_BACKEND", "json")
+    store = SqliteProfileStore() if backend == "sqlite" else JsonProfileStore()
+    return DebouncedProfileStore(store, delay)
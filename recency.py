@@ -0,0 +1,83 @@
+# recency.py
+# 最近吃过的菜：滚动窗口索引 (菜名 -> 最近一次吃的日期) + 按天衰减的降权
+# 启动时从历史收藏读一次最近 N 天，之后每收藏一天增量更新；选菜时每个候选只查一次字典
+import datetime
+import hashlib
+import os
+import threading
+
+WINDOW_DAYS = int(os.environ.get("YOUYOU_RECENCY_DAYS", "7"))         # 只看最近这么多天
+DECAY = float(os.environ.get("YOUYOU_RECENCY_DECAY", "0.6"))          # 每往前一天，降权幅度乘这个系数
+STRENGTH = float(os.environ.get("YOUYOU_RECENCY_STRENGTH", "0.9"))    # 昨天 (或今天) 吃过：权重 ×(1 - 0.9)
+HISTORY_PAGE = 50
+
+
+def item_dishes(item):
+    """历史条目 -> 菜名 (不含水果；空格子 None / "" 跳过)"""
+    m = item.get('menu') or {}
+    names = [m.get('breakfast')] + list(m.get('lunch') or ()) + list(m.get('dinner') or ())
+    return [n for n in names if isinstance(n, str) and n]
+
+def _ordinal(date):
+    if isinstance(date, datetime.date): return date.toordinal()
+    try: return datetime.date.fromisoformat(str(date)[:10]).toordinal()
+    except ValueError: return None
+
+
+class Penalties(dict):
+    """菜名 -> 权重倍数 (0~1)；key 是内容摘要，用作抽样器 / 当日缓存的键"""
+    __slots__ = ("key",)
+
+
+class RecencyIndex:
+    """菜名 -> 最近一次吃的日期序号；只保留窗口内的菜，add 增量维护"""
+
+    def __init__(self, window_days=WINDOW_DAYS, decay=DECAY, strength=STRENGTH):
+        self.window, self.decay, self.strength = window_days, decay, strength
+        self.last = {}
+        self.version = 0
+        self._lock = threading.Lock()
+        self._cached = (None, None)   # ((今天, 版本), Penalties)
+
+    @classmethod
+    def from_history(cls, store, today=None, user_id=None, **kw):
+        """从 HistoryStore 倒着分页读，读到窗口外为止；给了 user_id 只收这个用户的条目"""
+        idx = cls(**kw)
+        cutoff = (today or datetime.date.today()).toordinal() - idx.window
+        offset = 0
+        while True:
+            page = store.recent(HISTORY_PAGE, offset, user=user_id)   # 按用户过滤交给存储 (SQLite 走索引)
+            for item in page: idx.add(item)
+            dates = [d for d in (_ordinal(i.get('date')) for i in page) if d is not None]
+            if len(page) < HISTORY_PAGE or (dates and max(dates) < cutoff): return idx
+            offset += HISTORY_PAGE
+
+    def add(self, item):
+        """记下一天的菜单 (history_item 的格式)；顺带清掉窗口外的菜"""
+        day = _ordinal(item.get('date'))
+        if day is None: return
+        with self._lock:
+            for n in item_dishes(item):
+                if self.last.get(n, -1) < day: self.last[n] = day
+            newest = max(self.last.values(), default=day)
+            for n in [n for n, d in self.last.items() if d <= newest - self.window]: del self.last[n]
+            self.version += 1
+
+    def weight(self, age):
+        """隔了 age 天的权重倍数：age<=1 时 1-strength，之后每天衰减，窗口外为 1"""
+        if age >= self.window: return 1.0
+        return 1.0 - self.strength * self.decay ** max(age - 1, 0)
+
+    def penalties(self, today=None):
+        """今天的 菜名 -> 权重倍数；同一天、没有新记录时返回同一个对象"""
+        today = (today or datetime.date.today()).toordinal()
+        with self._lock:
+            token, cached = self._cached
+            if token == (today, self.version): return cached
+            out = Penalties()
+            for n, d in self.last.items():
+                w = self.weight(today - d)
+                if w < 1.0: out[n] = w
+            out.key = hashlib.sha1(repr(sorted(out.items())).encode("utf-8")).hexdigest()[:16] if out else ""
+            self._cached = ((today, self.version), out)
+            return out
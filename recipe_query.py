@@ -0,0 +1,131 @@
+# recipe_query.py
+# 营养 / 标签 / 难度 / 用时 倒排索引 + 小查询语言："补钙 AND ≤20分钟 AND NOT 海鲜"
+# 这几个字段不在常驻热数据里，进程启动时扫一遍 recipes.jsonl 建好；结果是按菜谱 id 的位图
+import re
+from bisect import bisect_left, bisect_right
+from functools import lru_cache
+from menu_engine import iter_bits
+from normalizer import normalize_ingredient
+from recipe_data import RECIPE_FILE, iter_recipes
+
+QUERY_CACHE_SIZE = 256
+# 食材大类 -> 食材 (查询里可以直接写 "NOT 海鲜")
+INGREDIENT_GROUPS = {
+    "海鲜": ["鳕鱼", "虾仁", "三文鱼", "鱼", "蛤蜊", "干贝", "虾", "海带", "紫菜"],
+    "红肉": ["牛肉", "猪肉", "排骨", "羊肉", "猪肝"],
+    "奶制品": ["牛奶", "奶酪", "奶粉"],
+}
+
+_TOKEN = re.compile(r"\s*(\(|\)|[^\s()]+)")
+_RANGE = re.compile(r"^(难度)?(≤|<=|<|≥|>=|>|=)?(\d+|⭐+)(分钟)?$")   # ≤20分钟 / 20分钟 / ≤⭐⭐ / 难度≤2
+
+
+class QueryError(ValueError):
+    """查询语法错误"""
+
+
+def parse_minutes(text):
+    """ "15分钟" -> 15；认不出时返回 None"""
+    m = re.search(r"\d+", text or "")
+    return int(m.group()) if m else None
+
+
+class _Range:
+    """一个数值字段 (用时 / 难度星数)：按值排序 + 前缀位图，区间查询 = 二分 + 一次异或"""
+
+    def __init__(self, pairs):
+        pairs = sorted(pairs)
+        self.values = [v for v, _ in pairs]
+        self.prefix = [0]   # prefix[k] = 前 k 个 (最小的 k 个) 的位图
+        for _, rid in pairs: self.prefix.append(self.prefix[-1] | (1 << rid))
+
+    def mask(self, op, v):
+        lo, hi = bisect_left(self.values, v), bisect_right(self.values, v)
+        n = len(self.values)
+        a, b = {"≤": (0, hi), "<=": (0, hi), "<": (0, lo), "≥": (lo, n), ">=": (lo, n), ">": (hi, n), "=": (lo, hi)}[op]
+        return self.prefix[b] ^ self.prefix[a] if b > a else 0
+
+
+class TagIndex:
+    """词 -> 菜谱 id 位图；词 = 营养、标签、难度 (⭐⭐)、归一化食材、食材大类"""
+
+    def __init__(self, records):
+        self.postings = {}
+        self.all_mask = 0
+        minutes, stars = [], []
+        for rid, rec in records:
+            if rec.get("pool") == "fruit": continue
+            self.all_mask |= 1 << rid
+            terms = set(rec.get("tags") or ())
+            for f in ("nutrition", "difficulty"):
+                if rec.get(f): terms.add(rec[f])
+            ings = {normalize_ingredient(i) for i in rec["ingredients"]}
+            terms |= ings
+            terms.update(g for g, members in INGREDIENT_GROUPS.items() if ings & set(members))
+            for t in terms: self.postings[t] = self.postings.get(t, 0) | (1 << rid)
+            m = parse_minutes(rec.get("time"))
+            if m is not None: minutes.append((m, rid))
+            if rec.get("difficulty"): stars.append((rec["difficulty"].count("⭐"), rid))
+        self.minutes, self.stars = _Range(minutes), _Range(stars)
+        self.query = lru_cache(maxsize=QUERY_CACHE_SIZE)(self._query)
+
+    @classmethod
+    def from_file(cls, path=RECIPE_FILE):
+        return cls((rid, rec) for rid, _, rec in iter_recipes(path))
+
+    def term_mask(self, term):
+        """单个词；"补X" 同时匹配 "X" / "高X" (营养字段里写法不统一)，食材先归一化"""
+        m = self.postings.get(term, 0) | self.postings.get(normalize_ingredient(term), 0)
+        if term.startswith("补") and len(term) > 1:
+            m |= self.postings.get(term[1:], 0) | self.postings.get("高" + term[1:], 0)
+        return m
+
+    def _atom(self, tok):
+        r = _RANGE.match(tok)
+        if r:
+            diff, op, val, unit = r.groups()
+            n = val.count("⭐") if val.startswith("⭐") else int(val)
+            if unit and not diff: return self.minutes.mask(op or "=", n)
+            if diff and not unit or val.startswith("⭐") and op: return self.stars.mask(op or "=", n)
+        return self.term_mask(tok)
+
+    def _query(self, expr):
+        """expr := and (OR and)* ; and := not ([AND] not)* ; not := NOT not | ( expr ) | 词"""
+        toks = _TOKEN.findall(expr or "")
+        pos = 0
+        def peek(): return toks[pos].upper() if pos < len(toks) else None
+        def take():
+            nonlocal pos
+            pos += 1; return toks[pos - 1]
+        def p_or():
+            m = p_and()
+            while peek() == "OR": take(); m |= p_and()
+            return m
+        def p_and():
+            m = p_not()
+            while peek() not in (None, "OR", ")"):
+                if peek() == "AND": take()
+                m &= p_not()
+            return m
+        def p_not():
+            t = peek()
+            if t is None or t in ("AND", "OR", ")"): raise QueryError(f"查询不完整：{expr!r}")
+            take()
+            if t == "NOT": return self.all_mask & ~p_not()
+            if t == "(":
+                m = p_or()
+                if peek() != ")": raise QueryError(f"括号不配对：{expr!r}")
+                take(); return m
+            return self._atom(toks[pos - 1])
+        if not toks: return self.all_mask
+        m = p_or()
+        if pos != len(toks): raise QueryError(f"多余的 {toks[pos]!r}：{expr!r}")
+        return m
+
+    def ids(self, mask): return list(iter_bits(mask))
+
+
+@lru_cache(maxsize=None)
+def default_tag_index():
+    """基于 recipes.jsonl 的进程级标签索引"""
+    return TagIndex.from_file()
@@ -0,0 +1,118 @@
+# shopping.py
+# 缺货清单：按菜格增量维护 (换一道菜只加减这一道的贡献)，解析 full_ingredients 里的用量并按冰箱分类汇总
+import re
+from functools import lru_cache
+from normalizer import SYNONYM_MAP, normalize_ingredient
+
+OTHER_CATEGORY = "📝 其他"
+_SPLIT_RE = re.compile(r"[，,、;；]")
+_QTY_RE = re.compile(r"^(?P<name>.*?)\s*(?P<qty>\d+(?:\.\d+)?)\s*(?P<unit>[a-zA-Z一-鿿]{0,2})$")
+_UNIT_ALIAS = {"克": "g", "G": "g", "毫升": "ml", "ML": "ml", "Ml": "ml"}
+
+# 归一化名 -> 所有同义写法 (含自己)，用来在 full_ingredients 里认出 "牛腩" 就是 牛肉
+_ALIASES = {}
+for _k, _v in SYNONYM_MAP.items(): _ALIASES.setdefault(_v, {_v}).add(_k)
+
+def parse_full_ingredients(text):
+    """'老南瓜 60g，小米 30g' -> [('老南瓜', 60.0, 'g'), ('小米', 30.0, 'g')]；没写用量的 qty/unit 为 None"""
+    out = []
+    for part in _SPLIT_RE.split(text or ""):
+        part = part.strip()
+        if not part: continue
+        m = _QTY_RE.match(part)
+        if m and m.group("name"):
+            unit = m.group("unit") or None
+            out.append((m.group("name").strip(), float(m.group("qty")), _UNIT_ALIAS.get(unit, unit)))
+        else: out.append((part, None, None))
+    return out
+
+@lru_cache(maxsize=4096)
+def _requirements(ingredients, full_text):
+    parsed = parse_full_ingredients(full_text)
+    reqs = []
+    for raw in ingredients:
+        norm = normalize_ingredient(raw)
+        aliases = _ALIASES.get(norm, {norm}) | {raw}
+        qty = unit = None
+        for name, q, u in parsed:
+            if q is not None and any(a in name for a in aliases): qty, unit = q, u; break
+        reqs.append((norm, raw, qty, unit))
+    return tuple(reqs)
+
+def _category_index(categories):
+    """冰箱分类 -> (分类顺序, 归一化名 -> 分类)"""
+    cat = {}
+    for c, items in categories.items():
+        for i in items: cat.setdefault(normalize_ingredient(i), c)
+    return tuple(categories) + (OTHER_CATEGORY,), cat
+
+@lru_cache(maxsize=None)
+def default_category_index():
+    """基于 FRIDGE_CATEGORIES；所有会话的缺货清单共用这一份"""
+    from recipe_data import FRIDGE_CATEGORIES
+    return _category_index(FRIDGE_CATEGORIES)
+
+def dish_requirements(dish):
+    """一道菜需要的食材：((归一化名, 原名, 用量, 单位), ...)，按菜缓存"""
+    return _requirements(tuple(dish['ingredients']), dish.get('full_ingredients', ""))
+
+
+class ShoppingList:
+    """缺货清单；set_slot 增量换菜，set_fridge 冰箱变了才整体重算"""
+
+    def __init__(self, fridge_items=(), categories=None):
+        self.category_order, self._category = default_category_index() if categories is None else _category_index(categories)
+        self.fridge = {normalize_ingredient(i) for i in fridge_items}
+        self.slots = {}    # 菜格 -> 菜
+        self.totals = {}   # 归一化名 -> {"name", "count", "qty": {单位: 数量}}
+
+    def _apply(self, dish, sign):
+        for norm, raw, qty, unit in dish_requirements(dish):
+            if norm in self.fridge: continue
+            t = self.totals.setdefault(norm, {"name": raw, "count": 0, "qty": {}})
+            t["count"] += sign
+            if qty is not None:
+                t["qty"][unit] = t["qty"].get(unit, 0) + sign * qty
+                if abs(t["qty"][unit]) < 1e-9: del t["qty"][unit]
+            if t["count"] <= 0: del self.totals[norm]
+
+    def set_slot(self, slot, dish):
+        """换掉某个菜格的菜 (dish 为 None 表示清空)"""
+        old = self.slots.pop(slot, None)
+        if old: self._apply(old, -1)
+        if dish:
+            self.slots[slot] = dish; self._apply(dish, +1)
+
+    def set_menu(self, menu, slots):
+        for s in slots: self.set_slot(s, menu.get(s))
+
+    def set_fridge(self, fridge_items):
+        self.fridge = {normalize_ingredient(i) for i in fridge_items}
+        self.totals = {}
+        for d in self.slots.values(): self._apply(d, +1)
+
+    def category_of(self, norm): return self._category.get(norm, OTHER_CATEGORY)
+
+    def items(self):
+        """[{name, norm, count, qty, category}]，按冰箱分类顺序排列"""
+        order = {c: i for i, c in enumerate(self.category_order)}
+        out = [dict(t, norm=n, category=self.category_of(n)) for n, t in self.totals.items()]
+        return sorted(out, key=lambda x: order[x["category"]])
+
+    def grouped(self):
+        groups = {}
+        for it in self.items(): groups.setdefault(it["category"], []).append(it)
+        return groups
+
+    def names(self): return [t["name"] for t in self.totals.values()]
+
+    def __len__(self): return len(self.totals)
+
+    def __iter__(self): return iter(self.names())
+
+
+def format_item(it):
+    """'南瓜 60g' / '鸡蛋 ×2'"""
+    qty = " + ".join(f"{q:g}{u or ''}" for u, q in it["qty"].items())
+    if qty: return f"{it['name']} {qty}"
+    return f"{it['name']} ×{it['count']}" if it["count"] > 1 else it["name"]
@@ -0,0 +1,99 @@
+# styles.py
+# 页面样式 (模块常量，只在导入时构造一次；每次 rerun 只是把这段字符串发给前端)
+
+APP_CSS = """
+<style>
+    /* 1. 基础设置 */
+    .stApp { background-color: #F5F5F7; }
+    h1, h2, h3, h4, p, span, div, button { font-family: -apple-system, BlinkMacSystemFont, "PingFang SC", sans-serif; }
+    #MainMenu {visibility: hidden;} footer {visibility: hidden;}
+
+    /* 2. 顶部 Header */
+    .header-wrapper {
+        display: flex; align-items: center; justify-content: space-between;
+        padding: 5px 0 15px 0;
+    }
+    .header-left { display: flex; align-items: center; gap: 12px; }
+    .header-img { width: 55px; height: 55px; border-radius: 50%; box-shadow: 0 2px 8px rgba(0,0,0,0.1); }
+    .header-title { font-size: 22px; font-weight: 800; color: #1D1D1F; letter-spacing: -0.5px; }
+    
+    /* 顶部功能图标 */
+    div[data-testid="column"] { flex: 1 !important; min-width: 0 !important; }
+    .icon-btn button {
+        border-radius: 12px !important; border: none !important;
+        height: 40px !important; width: 40px !important;
+        padding: 0 !important; margin: 0 auto !important;
+        display: flex !important; align-items: center !important; justify-content: center !important;
+        color: white !important; font-size: 18px !important;
+        box-shadow: 0 2px 6px rgba(0,0,0,0.1) !important;
+    }
+    
+    /* 3. 生成按钮 */
+    .gen-btn button {
+        width: 100% !important; height: 50px !important; border-radius: 14px !important;
+        background: #FF9F1C !important; color: white !important;
+        font-size: 18px !important; font-weight: 700 !important; border: none !important;
+        box-shadow: 0 4px 12px rgba(255, 159, 28, 0.3) !important;
+        margin-top: 5px;
+    }
+    .hint-text { text-align: center; color: #999; font-size: 12px; margin-top: 8px; margin-bottom: 20px; }
+
+    /* 4. 菜品卡片 (Row Layout) */
+    .dish-card {
+        background: white; border-radius: 20px; margin-bottom: 20px;
+        box-shadow: 0 4px 20px rgba(0,0,0,0.04); overflow: hidden;
+    }
+    .card-header { padding: 10px; color: white; font-weight: 800; font-size: 16px; text-align: center; letter-spacing: 2px; }
+    .bg-orange { background: #FF9F1C; } .bg-blue { background: #007AFF; } .bg-purple { background: #AF52DE; }
+
+    /* ★★★ 核心：一行4按钮布局 ★★★ */
+    
+    /* 菜名 */
+    .dish-name-text { 
+        font-size: 16px; font-weight: 700; color: #1D1D1F; 
+        white-space: nowrap; overflow: hidden; text-overflow: ellipsis;
+        padding-left: 5px; line-height: 2.2;
+    }
+
+    /* 通用操作按钮 (圆形无框) */
+    .action-btn button {
+        background: transparent !important; border: none !important; 
+        width: 32px !important; height: 32px !important; padding: 0 !important;
+        font-size: 18px !important; color: #8E8E93 !important;
+        box-shadow: none !important; margin: 0 auto !important;
+        display: flex !important; align-items: center !important; justify-content: center !important;
+        border-radius: 50% !important;
+    }
+    .action-btn button:hover { background: #F2F2F7 !important; }
+    
+    /* 状态高亮 */
+    .btn-liked button { color: #FF3B30 !important; transform: scale(1.1); }
+    .btn-disliked button { color: #333 !important; }
+    
+    /* 烹饪按钮 (品牌色小圆) - 视觉上稍微突出一点 */
+    .cook-btn-small button {
+        color: #007AFF !important;
+        font-size: 18px !important;
+        font-weight: bold !important;
+    }
+
+    /* 食材条 */
+    .ing-scroll { 
+        display: flex; overflow-x: auto; gap: 6px; padding: 5px 15px 12px 15px;
+        -webkit-overflow-scrolling: touch; scrollbar-width: none;
+    }
+    .ing-scroll::-webkit-scrollbar { display: none; }
+    .ing-pill {
+        background: #F2F2F7; color: #666; padding: 3px 10px; 
+        border-radius: 10px; font-size: 12px; white-space: nowrap;
+    }
+    .ing-hit { background: #FFF4E5; color: #FF9500; }
+
+    /* 历史卡片 */
+    .hist-card { background: white; border-radius: 12px; padding: 12px; border: 1px solid #EEE; margin-bottom: 8px; }
+    .hist-head { color: #FF9F1C; font-weight: bold; font-size: 13px; margin-bottom: 4px; }
+    .hist-txt { font-size: 12px; color: #666; line-height: 1.4; }
+    
+    .receipt-card { background: #FFF; padding: 15px; border: 1px dashed #DDD; border-radius: 10px; font-size: 14px; text-align: center; }
+</style>
+"""
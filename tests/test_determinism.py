@@ -0,0 +1,59 @@
+# tests/test_determinism.py
+# 可复现：同一 (用户, 日期, 第几次) 得到同一份菜单 (有没有 day_cache 都一样)，不同用户不同菜单；菜谱文件变了缓存作废
+#
+#   python -m pytest -q tests
+import datetime
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("YOUYOU_FONT_DOWNLOAD", "0")
+
+import pytest
+import day_cache
+from day_cache import DayCache, cache_key, recipes_digest
+from kitchen_engine import MENU_SLOTS, MenuSession, default_profile
+from menu_engine import default_index
+
+DAY = datetime.date(2026, 3, 1)
+
+
+def names(menu): return {k: menu[k]['name'] if menu.get(k) else None for k in MENU_SLOTS}
+
+def menus(user, n=1, solver=False, date=DAY, **kw):
+    s = MenuSession(default_profile(), user_id=user, **kw)
+    return [names(s.generate(solver=solver, date=date)) for _ in range(n)]
+
+
+@pytest.mark.parametrize("solver", [False, True])
+def test_same_user_date_and_count_give_same_menu(solver):
+    assert menus("alice", 3, solver) == menus("alice", 3, solver)
+
+@pytest.mark.parametrize("solver", [False, True])
+def test_day_cache_returns_the_same_menu(solver, tmp_path):
+    cache = DayCache(str(tmp_path))
+    first = menus("alice", 2, solver, day_cache=cache)
+    assert menus("alice", 2, solver, day_cache=DayCache(str(tmp_path))) == first   # 磁盘命中
+    assert menus("alice", 2, solver) == first                                      # 和不走缓存一样
+
+def test_regenerating_gives_a_new_menu():
+    first, second = menus("alice", 2)
+    assert first != second
+
+def test_different_users_get_different_menus():
+    users = [f"family{i}" for i in range(5)]
+    assert len({tuple(menus(u)[0].values()) for u in users}) > 1
+
+def test_different_days_get_different_menus():
+    assert menus("alice", date=DAY) != menus("alice", date=DAY + datetime.timedelta(days=1))
+
+def test_cache_key_tracks_version_and_recipe_file(tmp_path, monkeypatch):
+    index, profile = default_index(), default_profile()
+    key = cache_key(1, profile, index)
+    monkeypatch.setattr(day_cache, "CACHE_VERSION", day_cache.CACHE_VERSION + 1)
+    assert cache_key(1, profile, index) != key
+    f = tmp_path / "recipes.jsonl"
+    f.write_text('{"name": "a"}\n', encoding="utf-8"); before = recipes_digest(str(f))
+    f.write_text('{"name": "a", "tags": ["补钙"]}\n', encoding="utf-8")
+    assert recipes_digest(str(f)) != before
+    assert recipes_digest(str(tmp_path / "missing.jsonl")) == ""
@@ -0,0 +1,66 @@
+# tests/test_fridge_vision.py
+# 冰箱拍照识别：纯色图认出对应食材、同一张图只识别一次、识别太慢时按超时返回
+#
+#   python -m pytest -q tests
+import io
+import os
+import sys
+import threading
+from concurrent.futures import TimeoutError
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+from PIL import Image
+from fridge_vision import REFERENCE_PALETTES, ColourHistogramRecognizer, RecognitionService, Recognizer
+
+
+def solid(rgb, size=(32, 32)):
+    buf = io.BytesIO(); Image.new("RGB", size, rgb).save(buf, "PNG")
+    return buf.getvalue()
+
+
+class Counting(Recognizer):
+    def __init__(self, labels=("番茄",)): self.labels, self.calls = list(labels), 0
+    def recognize(self, image_bytes): self.calls += 1; return self.labels
+
+
+class Blocking(Recognizer):
+    def __init__(self): self.release = threading.Event()
+    def recognize(self, image_bytes): self.release.wait(5); return ["玉米"]
+
+
+@pytest.fixture
+def recognizer(): return ColourHistogramRecognizer(sample_dir=None)
+
+@pytest.mark.parametrize("label", ["西红柿", "玉米", "茄子", "西兰花"])
+def test_solid_colour_is_recognised(recognizer, label):
+    rgb = REFERENCE_PALETTES[label][0][0]
+    assert recognizer.recognize(solid(rgb))[0] == label
+
+def test_grey_image_has_no_labels(recognizer):
+    assert recognizer.recognize(solid((128, 128, 128))) == []
+
+def test_recognizer_must_implement_recognize():
+    class Empty(Recognizer): pass
+    with pytest.raises(TypeError): Empty()
+
+def test_identical_bytes_hit_cache_and_normalize():
+    rec = Counting(["番茄", "西红柿"])
+    service = RecognitionService(rec, max_workers=1)
+    data = solid((210, 35, 30))
+    assert service.recognize(data, timeout=5) == ["西红柿"]
+    assert service.recognize(bytes(data), timeout=5) == ["西红柿"]
+    assert rec.calls == 1
+    service.recognize(solid((245, 205, 55)), timeout=5)
+    assert rec.calls == 2
+
+def test_slow_recognition_times_out_then_finishes():
+    rec = Blocking()
+    service = RecognitionService(rec, max_workers=1)
+    data = solid((245, 205, 55))
+    with pytest.raises(TimeoutError): service.recognize(data, timeout=0.05)
+    fut = service.submit(data)   # 还在识别的同一张图合并到同一个任务
+    assert not fut.done()
+    rec.release.set()
+    assert fut.result(5) == ["玉米"]
@@ -0,0 +1,79 @@
+# tests/test_history_store.py
+# 历史收藏：两种后端都按用户分开 (recent 的 user 过滤、RecencyIndex.from_history)，老数据没记用户算 default
+#
+#   python -m pytest -q tests
+import datetime
+import json
+import os
+import sqlite3
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+from history_store import HistoryStore, JsonlHistoryStore, SqliteHistoryStore
+from profile_store import DEFAULT_USER
+from recency import RecencyIndex
+
+TODAY = datetime.date(2026, 3, 10)
+
+
+def item(day, dish, user=None):
+    it = {"date": f"2026-03-{day:02d}", "menu": {"breakfast": dish, "lunch": ["", "", ""], "dinner": ["", "", ""], "fruit": ""}}
+    if user: it["user"] = user
+    return it
+
+def open_store(backend, tmp_path, legacy=None):
+    if backend == "jsonl": return JsonlHistoryStore(str(tmp_path / "h.jsonl"), legacy)
+    return SqliteHistoryStore(str(tmp_path / "h.db"), legacy)
+
+def dishes(items): return [i["menu"]["breakfast"] for i in items]
+
+
+@pytest.fixture(params=["jsonl", "sqlite"])
+def store(request, tmp_path):
+    s = open_store(request.param, tmp_path)
+    s.append(item(5, "老粥"))   # 没记用户的老条目
+    for day in range(6, 10):
+        s.append(item(day, f"a{day}", "alice")); s.append(item(day, f"b{day}", "bob"))
+    return s
+
+
+def test_recent_filters_by_user_and_pages(store):
+    assert dishes(store.recent(10, user="alice")) == ["a9", "a8", "a7", "a6"]
+    assert dishes(store.recent(2, 1, user="bob")) == ["b8", "b7"]
+    assert dishes(store.recent(10, user=DEFAULT_USER)) == ["老粥"]
+    assert len(store.recent(100)) == store.count() == 9
+    assert all(i.get("user") == "alice" for i in store.recent(10, user="alice"))
+
+def test_from_history_keeps_families_apart(store):
+    alice = RecencyIndex.from_history(store, today=TODAY, user_id="alice").penalties(TODAY)
+    bob = RecencyIndex.from_history(store, today=TODAY, user_id="bob").penalties(TODAY)
+    assert set(alice) == {"a6", "a7", "a8", "a9"}
+    assert set(bob) == {"b6", "b7", "b8", "b9"}
+
+def test_interface_is_abstract():
+    class NoCount(HistoryStore):
+        def append(self, item): pass
+        def recent(self, limit=10, offset=0, user=None): return []
+    with pytest.raises(TypeError): NoCount()
+
+@pytest.mark.parametrize("backend", ["jsonl", "sqlite"])
+def test_legacy_import_keeps_user(backend, tmp_path):
+    legacy = tmp_path / "menu_history.json"
+    legacy.write_text(json.dumps([item(2, "新", "bob"), item(1, "旧")], ensure_ascii=False), encoding="utf-8")
+    s = open_store(backend, tmp_path, str(legacy))
+    assert dishes(s.recent(10, user="bob")) == ["新"]
+    assert dishes(s.recent(10, user=DEFAULT_USER)) == ["旧"]
+
+def test_sqlite_without_user_column_is_migrated(tmp_path):
+    path = str(tmp_path / "h.db")
+    with sqlite3.connect(path) as db:
+        db.execute("CREATE TABLE history (id INTEGER PRIMARY KEY AUTOINCREMENT, date TEXT NOT NULL, menu TEXT NOT NULL)")
+        db.execute("INSERT INTO history (date, menu) VALUES (?, ?)", ("2026-03-01", json.dumps(item(1, "旧")["menu"])))
+    db.close()
+    s = SqliteHistoryStore(path, None)
+    s.append(item(2, "新", "alice"))
+    assert dishes(s.recent(10, user="alice")) == ["新"]
+    assert dishes(s.recent(10, user=DEFAULT_USER)) == ["旧"]
+    assert "user" not in s.recent(10, user=DEFAULT_USER)[0]
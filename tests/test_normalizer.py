@@ -0,0 +1,78 @@
+# tests/test_normalizer.py
+# 食材归一化：调料 / 加工品不能归到原料上，过敏原按组展开
+#
+#   python -m pytest -q tests
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("YOUYOU_FONT_DOWNLOAD", "0")
+
+import pytest
+from kitchen_engine import default_profile
+from menu_engine import RecipeIndex, default_index, pick_dish, profile_masks
+from normalizer import SYNONYM_MAP, IngredientNormalizer, allergen_ingredients, exact_ingredient, normalize_ingredient, parse_fridge_entry
+from recipe_data import RECIPES_DB
+
+VOCAB = ["玉米", "南瓜", "西红柿", "土豆", "鸡蛋", "猪肉", "虾仁", "茄子", "花生", "豆腐", "鸡肉"]
+
+
+@pytest.fixture
+def norm(): return IngredientNormalizer(SYNONYM_MAP, VOCAB)
+
+
+@pytest.mark.parametrize("name", ["玉米油", "南瓜子", "番茄酱", "花生油", "南瓜饼", "土豆粉", "豆腐干", "鸡蛋饼"])
+def test_processed_food_kept_as_is(norm, name):
+    assert norm.normalize(name) == name
+    assert norm.extract(name) == []
+
+@pytest.mark.parametrize("name, expected", [
+    ("番茄", "西红柿"), ("两个番茄", "西红柿"), ("冷冻基围虾", "虾仁"), ("猪肉末", "猪肉"),
+    ("土豆片", "土豆"), ("茄子", "茄子"), ("西红市", "西红柿"), ("紫茄子", "茄子"), ("鸡肉丸子", "鸡肉"),
+])
+def test_plain_ingredients_still_normalize(norm, name, expected):
+    assert norm.normalize(name) == expected
+
+def test_extract_skips_condiment_but_keeps_others(norm):
+    assert norm.extract("番茄酱鸡蛋") == ["鸡蛋"]
+    assert norm.extract("番茄土豆") == ["西红柿", "土豆"]
+
+def test_suffix_rule_only_covers_condiments(norm):
+    assert norm.extract("紫茄子") == ["茄子"]
+    assert norm.extract("鸡肉丸子") == ["鸡肉"]
+    assert norm.extract("豆腐干炒鸡蛋") == ["鸡蛋"]
+
+def test_fridge_entry_keeps_condiments():
+    assert parse_fridge_entry("番茄酱，玉米油、两个番茄") == ["番茄酱", "玉米油", "西红柿"]
+
+def test_exact_only_uses_spelling_and_synonyms(norm):
+    assert norm.exact("番茄") == "西红柿"
+    assert norm.exact("南瓜子") == "南瓜子"
+    assert norm.exact("两个番茄") == "两个番茄"
+
+def test_allergen_mask_does_not_guess():
+    db = {"lunch_veg": [{"name": "南瓜羹", "ingredients": ["南瓜"], "type": "veg"},
+                        {"name": "番茄蛋", "ingredients": ["西红柿", "鸡蛋"], "type": "veg"}]}
+    index = RecipeIndex(db)
+    _, allergen = profile_masks(index, {"allergens": ["南瓜子"]})
+    assert allergen == 0
+    _, allergen = profile_masks(index, {"allergens": ["番茄"]})
+    assert allergen == index.mask_of(["西红柿"])
+    assert exact_ingredient("南瓜子") == "南瓜子" and normalize_ingredient("南瓜子") == "南瓜子"
+
+@pytest.mark.parametrize("allergen, covered", [("虾", "虾仁"), ("虾", "基围虾"), ("奶粉", "牛奶"), ("麦麸", "面粉"), ("麦麸", "面条")])
+def test_allergen_groups(allergen, covered):
+    assert exact_ingredient(covered) in allergen_ingredients(allergen)
+
+def test_shrimp_allergy_removes_shrimp_dishes():
+    index, profile = default_index(), dict(default_profile(), allergens=["虾"])
+    _, allergen = profile_masks(index, profile)
+    assert allergen & index.mask_of(["虾仁"])
+    shrimp = {d["name"] for pool in RECIPES_DB.values() for d in pool if not isinstance(d, str) and {"虾仁", "海鲜"} & set(d["ingredients"])}
+    assert shrimp
+    rng = random.Random(0)
+    for pool_key in RECIPES_DB:
+        for _ in range(30):
+            d = pick_dish(index, pool_key, profile, rng)
+            assert d is None or d["name"] not in shrimp
@@ -0,0 +1,44 @@
+# tests/test_perf.py
+# 计时开关：?perf=1 只对本会话 (本线程) 生效；按钮回调比脚本先跑，它的耗时要算进同一次 rerun
+#
+#   python -m pytest -q tests
+import os
+import sys
+import threading
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import perf
+
+
+def test_session_switch_is_per_thread():
+    mine, seen = perf.Stats(), {}
+    perf.begin_rerun(mine, session_on=True)
+    t = threading.Thread(target=lambda: seen.update(other=perf.enabled())); t.start(); t.join()
+    assert perf.enabled() and not seen["other"]
+    perf.end_rerun()
+    perf.begin_rerun(mine, session_on=False)
+    assert not perf.enabled()
+
+def test_callback_time_lands_in_the_same_rerun():
+    session = perf.Stats()
+    perf.begin_callback(session, session_on=True)
+    with perf.span("ui.callback"): pass
+    rerun = perf.begin_rerun(session, session_on=True)   # 脚本开头：接着用回调开的那份
+    with perf.span("ui.script"): pass
+    assert perf.end_rerun() is rerun
+    assert {"ui.callback", "ui.script", "rerun"} <= set(rerun.ops)
+    assert session.ops["ui.callback"][0] == 1
+
+def test_next_rerun_starts_fresh():
+    session = perf.Stats()
+    perf.begin_callback(session, session_on=True); perf.end_rerun()
+    rerun = perf.begin_rerun(session, session_on=True)
+    assert rerun.ops == {}
+    perf.end_rerun()
+
+def test_callback_off_records_nothing():
+    session = perf.Stats()
+    perf.begin_callback(session, session_on=False)
+    with perf.span("ui.callback"): pass
+    assert perf.begin_rerun(session, session_on=False) is None and session.ops == {}
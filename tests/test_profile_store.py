@@ -0,0 +1,52 @@
+# tests/test_profile_store.py
+# 档案存储：接口缺方法时创建就报错；并发 flush 时旧快照不会盖掉新快照
+#
+#   python -m pytest -q tests
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+from profile_store import DebouncedProfileStore, JsonProfileStore, ProfileStore
+
+
+class SlowStore(JsonProfileStore):
+    """每次写之前停一下，把 flush 之间的竞争放大"""
+
+    def save(self, user_id, data):
+        time.sleep(0.002); super().save(user_id, data)
+
+
+def test_incomplete_backend_fails_on_creation():
+    class NoUsers(ProfileStore):
+        def load(self, user_id): return None
+        def save(self, user_id, data): pass
+    with pytest.raises(TypeError): NoUsers()
+
+def test_concurrent_flushes_keep_newest_snapshot(tmp_path):
+    store = DebouncedProfileStore(SlowStore(str(tmp_path)), delay=0.001)
+    def writer(start):
+        for i in range(start, start + 50):
+            store.save("u", {"n": i}); store.flush()
+    for start in range(0, 200, 50):
+        threads = [threading.Thread(target=writer, args=(start,)), threading.Thread(target=store.flush)]
+        for t in threads: t.start()
+        for t in threads: t.join()
+    store.flush()
+    assert store.store.load("u") == {"n": 199}
+
+def test_load_sees_snapshot_while_it_is_being_written(tmp_path):
+    gate, entered = threading.Event(), threading.Event()
+    class Blocking(JsonProfileStore):
+        def save(self, user_id, data):
+            entered.set(); gate.wait(5); super().save(user_id, data)
+    store = DebouncedProfileStore(Blocking(str(tmp_path)), delay=60)
+    store.save("u", {"n": 1})
+    t = threading.Thread(target=store.flush); t.start()
+    entered.wait(5)
+    assert store.load("u") == {"n": 1}
+    gate.set(); t.join()
+    assert store.load("u") == {"n": 1}
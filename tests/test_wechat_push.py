@@ -0,0 +1,104 @@
+# tests/test_wechat_push.py
+# 微信推送：对着本地 http.server 假 PushPlus 测 成功 / 429 重试 / 永久 4xx / 重启后发件箱续发 / 租约接手
+#
+#   python -m pytest -q tests
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("YOUYOU_FONT_DOWNLOAD", "0")
+
+import pytest
+from wechat_push import Outbox, PushDispatcher
+
+
+class PushPlusStub(ThreadingHTTPServer):
+    """按 token 决定回应：plan[token] 是依次返回的状态码列表，用完后一直 200；received 记下收到的 token"""
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), _Handler)
+        self.plan, self.received, self.lock = {}, [], threading.Lock()
+
+    @property
+    def url(self): return f"http://127.0.0.1:{self.server_address[1]}/send"
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        srv = self.server
+        with srv.lock:
+            srv.received.append(body["token"])
+            queue = srv.plan.get(body["token"], [])
+            status = queue.pop(0) if queue else 200
+        out = json.dumps({"code": 200 if status == 200 else status, "msg": "stub"}).encode()
+        self.send_response(status); self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(out))); self.end_headers(); self.wfile.write(out)
+
+    def log_message(self, *args): pass
+
+
+@pytest.fixture
+def server():
+    srv = PushPlusStub()
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    yield srv
+    srv.shutdown(); srv.server_close()
+
+@pytest.fixture
+def outbox_path(tmp_path): return str(tmp_path / "push_outbox.jsonl")
+
+def dispatcher(server, outbox_path, **kw):
+    kw.setdefault("backoff_base", 0.01)
+    return PushDispatcher(url=server.url, outbox_path=outbox_path, workers=1, **kw)
+
+
+def test_success(server, outbox_path):
+    d = dispatcher(server, outbox_path)
+    d.send("ok", "标题", "<p>正文</p>")
+    assert d.flush(5)
+    assert server.received == ["ok"] and d.stats["sent"] == 1 and d.pending() == 0
+    d.close()
+
+def test_429_is_retried(server, outbox_path):
+    server.plan["busy"] = [429, 429]
+    d = dispatcher(server, outbox_path)
+    d.send("busy", "标题", "正文")
+    assert d.flush(5)
+    assert server.received == ["busy"] * 3
+    assert d.stats == {"sent": 1, "retried": 2, "failed": 0}
+    d.close()
+
+def test_permanent_4xx_is_not_retried(server, outbox_path):
+    server.plan["bad"] = [403]
+    d = dispatcher(server, outbox_path)
+    d.send("bad", "标题", "正文")
+    assert d.flush(5)
+    assert server.received == ["bad"] and d.stats["failed"] == 1 and d.pending() == 0
+    d.close()
+
+def test_outbox_replayed_after_restart(server, outbox_path):
+    server.plan["later"] = [503]
+    d = dispatcher(server, outbox_path, backoff_base=60)   # 第一次失败后要等一分钟才重试
+    d.send("later", "标题", "正文")
+    deadline = time.time() + 5
+    while d.stats["retried"] == 0 and time.time() < deadline: time.sleep(0.01)
+    d.close()
+    d = dispatcher(server, outbox_path)
+    assert d.pending() == 1
+    assert d.flush(5)
+    assert server.received == ["later", "later"] and d.pending() == 0
+    d.close()
+    assert Outbox(outbox_path).pending == {}
+
+def test_live_lease_is_kept_and_expired_lease_taken_over(outbox_path):
+    first = Outbox(outbox_path, lease_ttl=0.3)
+    first.add([{"id": "m1", "token": "t", "title": "", "content": "", "attempts": 0, "next_at": 0}])
+    assert Outbox(outbox_path).pending == {}            # 主人还在续约
+    first._stop.set()                                   # 主人卡死 / 被杀，不再续约
+    time.sleep(0.4)
+    assert list(Outbox(outbox_path).pending) == ["m1"]
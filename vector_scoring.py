@@ -0,0 +1,173 @@
+# vector_scoring.py
+# 批量打分：菜 × 食材 关联矩阵 + 档案 × 食材 (冰箱 / 过敏原) 矩阵，几次矩阵乘法算出所有档案对所有菜的
+# 缺货数、过敏标记、喜好 / 营养目标权重；权重规则和 menu_engine.dish_score / RecipeIndex.sampler 完全一致
+# 用于夜间批量推送 ("现在冰箱里能做什么" / 一次给成百上千个档案出菜单)；没装 numpy 时退回逐个 plan_day
+import random
+from menu_engine import DAY_SLOTS, SCORE_BASE, SCORE_DISLIKED, SCORE_GOAL, SCORE_IN_STOCK, SCORE_LIKED, default_index, plan_day
+from normalizer import exact_ingredient, expand_allergens, normalize_ingredient
+
+try: import numpy as np
+except ImportError: np = None   # 可选依赖
+
+
+def available(): return np is not None
+
+
+class PoolMatrix:
+    """单个菜池：incidence[d, i] = 第 d 道菜用到第 i 种食材"""
+
+    def __init__(self, pool, n_ing):
+        self.dishes = pool.dishes
+        self.names = pool.names
+        self.all_mask = pool.all_mask
+        self.incidence = np.zeros((len(pool.dishes), n_ing), dtype=np.float32)
+        for d, m in enumerate(pool.ing_masks):
+            while m:
+                low = m & -m; self.incidence[d, low.bit_length() - 1] = 1; m ^= low
+        self.ing_count = self.incidence.sum(axis=1)
+        self.red = np.array([bool(pool.red_mask >> d & 1) for d in range(len(pool.dishes))])
+
+    def name_matrix(self, name_lists):
+        """[[菜名]] -> 档案 × 菜 的布尔矩阵 (不在本池的菜名忽略)"""
+        out = np.zeros((len(name_lists), len(self.dishes)), dtype=bool)
+        for p, names in enumerate(name_lists):
+            for n in names:
+                d = self.names.get(n)
+                if d is not None: out[p, d] = True
+        return out
+
+    def mask_matrix(self, masks):
+        """[池内菜品位图] -> 档案 × 菜 的布尔矩阵"""
+        n = len(self.dishes)
+        rows = {m: np.array([bool(m >> d & 1) for d in range(n)]) for m in set(masks)}   # 同样的位图只展开一次
+        return np.array([rows[m] for m in masks]).reshape(len(masks), n)
+
+
+class CatalogueMatrix:
+    """整份菜谱的矩阵视图；食材编号和 RecipeIndex 共用，同一个索引只建一次即可"""
+
+    def __init__(self, index=None):
+        if np is None: raise ImportError("vector_scoring 需要 numpy (pip install numpy)")
+        self.index = index or default_index()
+        self.n_ing = len(self.index.ing_ids)
+        self.pools = {key: PoolMatrix(p, self.n_ing) for key, p in self.index.pools.items()}
+
+    def pool(self, pool_key):
+        p = self.index.pool(pool_key)   # 带晚餐 -> 午餐回落
+        return next(m for k, m in self.pools.items() if self.index.pools[k] is p) if p is not None else None
+
+    def profile_matrix(self, profiles, field, normalize=normalize_ingredient):
+        """档案 × 食材 0/1 矩阵 (先归一化；菜谱里没出现过的食材不占列)"""
+        out = np.zeros((len(profiles), self.n_ing), dtype=np.float32)
+        for p, prof in enumerate(profiles):
+            for name in prof.get(field) or ():
+                i = self.index.ing_ids.get(normalize(name))
+                if i is not None: out[p, i] = 1
+        return out
+
+    def prepare(self, profiles):
+        """一批档案的公共矩阵，多次 score 时复用"""
+        return {"fridge": self.profile_matrix(profiles, 'fridge_items'),
+                "allergen": self.profile_matrix([{'allergens': expand_allergens(p.get('allergens'))} for p in profiles], 'allergens', exact_ingredient),
+                "likes": [prof.get('likes') or () for prof in profiles],
+                "dislikes": [prof.get('dislikes') or () for prof in profiles],
+                "goals": [tuple(prof.get('nutrition_goals') or ()) for prof in profiles],
+                "filters": [prof.get('dish_filter') or "" for prof in profiles]}
+
+    def score(self, pool_key, profiles, batch=None, exclude=None, prefer_white=None):
+        """返回 dict：missing (档案 × 菜 缺货数)、allowed (过敏 / 排除 / 偏好之后的候选)、
+        in_stock (零缺货候选)、weights (抽样权重，与 RecipeIndex.sampler 相同)
+
+        exclude: 档案 × 菜 布尔矩阵；prefer_white: 每个档案是否只要白肉 (没有白肉可选时自动放宽)。
+        """
+        m = self.pool(pool_key)
+        P = len(profiles)
+        if m is None or not m.dishes: return None
+        batch = batch or self.prepare(profiles)
+        missing = m.ing_count[None, :] - batch["fridge"] @ m.incidence.T
+        allowed = (batch["allergen"] @ m.incidence.T) == 0
+        tags = [self.index.tag_masks(pool_key, g, f) for g, f in zip(batch["goals"], batch["filters"])]
+        if any(req is not None for _, req in tags):   # 筛选条件：筛完没菜可选的档案不筛 (同 RecipeIndex.select)
+            req = m.mask_matrix([m.all_mask if r is None else r for _, r in tags])
+            keep = (allowed & req).any(axis=1)
+            allowed = np.where(keep[:, None], allowed & req, allowed)
+        if exclude is not None: allowed &= ~exclude
+        if prefer_white is not None:
+            white = allowed & ~(m.red[None, :] & prefer_white[:, None])
+            keep = white.any(axis=1)
+            allowed = np.where(keep[:, None], white, allowed)
+        in_stock = allowed & (missing < 0.5)
+        has_stock = in_stock.any(axis=1)
+        final = np.where(has_stock[:, None], in_stock, allowed)
+        weights = np.full((P, len(m.dishes)), float(SCORE_BASE), dtype=np.float64)
+        weights += np.where(has_stock, SCORE_IN_STOCK, 0)[:, None]
+        weights += SCORE_LIKED * m.name_matrix(batch["likes"])
+        if any(boost for boost, _ in tags): weights += SCORE_GOAL * m.mask_matrix([boost for boost, _ in tags])
+        weights = np.where(m.name_matrix(batch["dislikes"]), float(SCORE_DISLIKED), weights)
+        weights = np.where(final, weights, 0.0)
+        return {"pool": m, "missing": missing.astype(np.int32), "allowed": allowed, "in_stock": in_stock, "weights": weights}
+
+    def cookable(self, profiles, pool_keys=None):
+        """每个档案现在就能做 (不缺货、不过敏) 的菜：[{菜池: [菜名]}]"""
+        batch = self.prepare(profiles)
+        out = [{} for _ in profiles]
+        for key in pool_keys or self.pools:
+            s = self.score(key, profiles, batch)
+            if s is None: continue
+            for p, row in enumerate(s["in_stock"]):
+                out[p][key] = [s["pool"].dishes[d]['name'] for d in np.flatnonzero(row)]
+        return out
+
+
+def sample_rows(weights, rng):
+    """每行按权重抽一个下标；全 0 的行返回 -1"""
+    cum = np.cumsum(weights, axis=1)
+    total = cum[:, -1]
+    u = rng.random(len(weights)) * total
+    idx = np.minimum((cum <= u[:, None]).sum(axis=1), weights.shape[1] - 1)
+    return np.where(total > 0, idx, -1)
+
+def _pick(cat, pool_key, profiles, batch, rng, exclude=None, prefer_white=None):
+    s = cat.score(pool_key, profiles, batch, exclude, prefer_white)
+    if s is None: return None, [None] * len(profiles)
+    idx = sample_rows(s["weights"], rng)
+    return s["pool"], [s["pool"].dishes[i] if i >= 0 else None for i in idx]
+
+def _exclude_same(pool_m, picked):
+    """排除矩阵：每个档案排除 picked 里对应的那道菜"""
+    ex = np.zeros((len(picked), len(pool_m.dishes)), dtype=bool)
+    for p, d in enumerate(picked):
+        if d is not None and d['name'] in pool_m.names: ex[p, pool_m.names[d['name']]] = True
+    return ex
+
+def plan_days(profiles, seed=None, catalogue=None):
+    """给一批档案各出一天菜单 (规则同 plan_day：晚餐不重复午餐荤菜、红肉后换白肉、两顿汤不同)
+
+    结果按档案顺序返回；同一 seed 结果相同。没装 numpy 时逐个调用 plan_day。
+    """
+    if np is None:
+        rng = random.Random(seed)
+        return [plan_day(default_index(), prof, rng) for prof in profiles]
+    cat = catalogue or CatalogueMatrix()
+    rng = np.random.default_rng(seed)
+    batch = cat.prepare(profiles)
+    menus = [{} for _ in profiles]
+    def put(slot, dishes):
+        for menu, d in zip(menus, dishes): menu[slot] = d
+    picks = {}
+    for slot, pool_key in DAY_SLOTS:
+        exclude = prefer = None
+        if slot == 'dinner_meat':
+            m = cat.pool(pool_key)
+            if m is not None:
+                exclude = _exclude_same(m, picks['lunch_meat'])
+                prefer = np.array([bool(d) and cat.index.is_red_meat(d['ingredients']) for d in picks['lunch_meat']])
+        elif slot == 'dinner_soup':
+            m = cat.pool(pool_key)
+            if m is not None: exclude = _exclude_same(m, picks['lunch_soup'])
+        _, picks[slot] = _pick(cat, pool_key, profiles, batch, rng, exclude, prefer)
+        put(slot, picks[slot])
+    fruit = cat.index.fruit
+    for menu, i in zip(menus, rng.integers(0, len(fruit), len(menus)) if fruit else [None] * len(menus)):
+        menu['fruit'] = fruit[i] if i is not None else None
+    return menus
@@ -0,0 +1,218 @@
+# wechat_push.py
+# 微信推送 (PushPlus)：按钮只负责入队，后台线程用连接池发送，失败指数退避重试
+# 没发出去的消息写在 push_outbox.jsonl 里，重启后接着发；多个进程共用这个文件，读写都加 history_store 的文件锁，
+# 每条消息记着负责发送的 Outbox (随机 id)，主人定时在 push_outbox.jsonl.leases 里续约；新打开的 Outbox 只接手租约过期的消息
+# (用随机 id 而不是 pid：pid 会被重用，死掉的主人可能看起来还活着)
+import heapq
+import itertools
+import json
+import os
+import random
+import threading
+import time
+import uuid
+from functools import lru_cache
+import requests
+from requests.adapters import HTTPAdapter
+from history_store import file_lock
+from menu_card import menu_card_key
+from vector_scoring import plan_days
+import perf
+
+PUSHPLUS_URL = os.environ.get("YOUYOU_PUSHPLUS_URL", "http://www.pushplus.plus/send")
+OUTBOX_FILE = "push_outbox.jsonl"
+MAX_ATTEMPTS = 6
+BACKOFF_BASE = 1.0    # 秒，第 n 次失败后等 base * 2^(n-1) (带抖动)
+BACKOFF_MAX = 60.0
+TIMEOUT = 10
+WORKERS = 2
+POOL_SIZE = 8
+RENDER_CACHE_SIZE = 256
+LEASE_TTL = 60.0      # 秒，主人这么久没续约就当它不在了 (每 1/3 个周期续一次)
+
+
+@lru_cache(maxsize=RENDER_CACHE_SIZE)
+def _render(names, fruit, nickname):
+    b, lm, lv, ls, dm, dv, ds = names
+    rows = [("🌅 早餐", [b, "🥛 热牛奶"]), ("☀️ 午餐", [lm, lv, ls]), ("🌙 晚餐", [dm, dv, ds]), ("🍎 加餐", [fruit])]
+    html = "".join(f"<h4>{t}</h4><p>{'<br>'.join(x for x in ds_ if x)}</p>" for t, ds_ in rows)
+    return f"{nickname} 的今日食谱", html
+
+def render_menu_message(menu, nickname):
+    """(标题, HTML 正文)；同一份菜单 + 昵称只渲染一次"""
+    return _render(*menu_card_key(menu, nickname))
+
+
+class PermanentPushError(Exception):
+    """重试也没用的错误 (token 无效等)"""
+
+
+def pooled_session(pool_size=POOL_SIZE):
+    s = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    s.mount("http://", adapter); s.mount("https://", adapter)
+    return s
+
+
+class Outbox:
+    """待发消息落盘：追加 {"op": "add"/"done", ...} 日志，打开时回放并压缩；pending 只含本 Outbox 负责的消息"""
+
+    def __init__(self, path=OUTBOX_FILE, lease_ttl=LEASE_TTL):
+        self.path, self.owner, self.lease_ttl = path, uuid.uuid4().hex, lease_ttl
+        self.leases_path = path + ".leases"
+        with file_lock(self.path):
+            live = self._renew()
+            records = self._replay()
+            for msg_id, (owner, m) in records.items():   # 没有主人 / 主人租约过期的消息由本 Outbox 接手
+                if owner not in live: records[msg_id] = (self.owner, m)
+            self.pending = {i: m for i, (owner, m) in records.items() if owner == self.owner}
+            self._compact(records)
+        self._stop = threading.Event()
+        threading.Thread(target=self._heartbeat, daemon=True).start()
+
+    def _renew(self, release=False):
+        """调用方持有文件锁：续约 (或交还) 本 Outbox 的租约并清掉过期的；返回 {还活着的主人: 到期时间}"""
+        now = time.time()
+        try:
+            with open(self.leases_path, "r", encoding="utf-8") as f: leases = json.load(f)
+        except (FileNotFoundError, ValueError): leases = {}
+        leases = {o: t for o, t in leases.items() if t > now}
+        if release: leases.pop(self.owner, None)
+        else: leases[self.owner] = now + self.lease_ttl
+        tmp = self.leases_path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f: json.dump(leases, f)
+        os.replace(tmp, self.leases_path)
+        return leases
+
+    def _heartbeat(self):
+        while not self._stop.wait(self.lease_ttl / 3):
+            with file_lock(self.path): self._renew()
+
+    def close(self):
+        """正常退出时交还租约，别的进程下次打开就能马上接手没发完的消息"""
+        self._stop.set()
+        with file_lock(self.path): self._renew(release=True)
+
+    def _replay(self):
+        records = {}   # id -> (owner id, msg)
+        if not os.path.exists(self.path): return records
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                try: rec = json.loads(line)
+                except ValueError: continue   # 写到一半断电的最后一行
+                if rec.get("op") == "add": records[rec["msg"]["id"]] = (rec.get("owner"), rec["msg"])
+                elif rec.get("op") == "done": records.pop(rec.get("id"), None)
+        return records
+
+    def _compact(self, records):
+        """调用方持有文件锁，别的进程此时追加不进来"""
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            for owner, m in records.values(): f.write(json.dumps({"op": "add", "owner": owner, "msg": m}, ensure_ascii=False) + "\n")
+        os.replace(tmp, self.path)
+
+    def _write(self, records):
+        with file_lock(self.path), open(self.path, "a", encoding="utf-8") as f:
+            f.write("".join(json.dumps(r, ensure_ascii=False) + "\n" for r in records))
+
+    def add(self, msgs):
+        for m in msgs: self.pending[m["id"]] = m
+        self._write([{"op": "add", "owner": self.owner, "msg": m} for m in msgs])
+
+    def done(self, msg_id, status="sent"):
+        self.pending.pop(msg_id, None)
+        self._write([{"op": "done", "id": msg_id, "status": status}])
+
+
+class PushDispatcher:
+    """后台投递：send / send_batch 立即返回，worker 按 next_at 顺序发送"""
+
+    def __init__(self, url=PUSHPLUS_URL, outbox_path=OUTBOX_FILE, workers=WORKERS, session=None,
+                 max_attempts=MAX_ATTEMPTS, backoff_base=BACKOFF_BASE, timeout=TIMEOUT):
+        self.url, self.max_attempts, self.backoff_base, self.timeout = url, max_attempts, backoff_base, timeout
+        self.session = session or pooled_session(max(workers, POOL_SIZE))
+        self.outbox = Outbox(outbox_path)
+        self.stats = {"sent": 0, "retried": 0, "failed": 0}
+        self._heap, self._seq, self._busy = [], itertools.count(), 0
+        self._cond = threading.Condition()
+        self._closed = False
+        for m in self.outbox.pending.values(): self._push(m)   # 上次没发完的
+        self._threads = [threading.Thread(target=self._worker, daemon=True) for _ in range(workers)]
+        for t in self._threads: t.start()
+
+    def _push(self, msg): heapq.heappush(self._heap, (msg.get("next_at", 0), next(self._seq), msg))
+
+    def send_batch(self, items):
+        """items: [(token, 标题, HTML)]；一次落盘后全部入队，返回消息 id 列表"""
+        msgs = [{"id": uuid.uuid4().hex, "token": t, "title": title, "content": content, "attempts": 0, "next_at": 0}
+                for t, title, content in items]
+        self.outbox.add(msgs)
+        with self._cond:
+            for m in msgs: self._push(m)
+            self._cond.notify_all()
+        return [m["id"] for m in msgs]
+
+    def send(self, token, title, content): return self.send_batch([(token, title, content)])[0]
+
+    def send_menus(self, items):
+        """items: [(token, 菜单, 昵称)]；多个档案同一份菜单时正文只渲染一次"""
+        return self.send_batch([(token, *render_menu_message(menu, nickname)) for token, menu, nickname in items])
+
+    def send_daily_digest(self, entries, seed=None):
+        """夜间批量推送：entries [(token, 档案)]，所有档案的菜单一次矩阵打分生成后入队"""
+        menus = plan_days([prof for _, prof in entries], seed)
+        return self.send_menus([(token, menu, prof.get('nickname', "")) for (token, prof), menu in zip(entries, menus)])
+
+    @perf.timed("push.deliver")
+    def _deliver(self, msg):
+        body = {"token": msg["token"], "title": msg["title"], "content": msg["content"], "template": "html"}
+        resp = self.session.post(self.url, json=body, timeout=self.timeout)
+        if 400 <= resp.status_code < 500 and resp.status_code != 429: raise PermanentPushError(f"HTTP {resp.status_code}")
+        resp.raise_for_status()
+        try: data = resp.json()
+        except ValueError: return
+        code = data.get("code", 200)
+        if code == 200: return
+        if 900 <= code < 1000 or code in (400, 401, 403): raise PermanentPushError(data.get("msg") or f"code {code}")
+        raise requests.HTTPError(data.get("msg") or f"code {code}")   # 服务端繁忙之类，重试
+
+    def _worker(self):
+        while True:
+            with self._cond:
+                while not self._closed and (not self._heap or self._heap[0][0] > time.time()):
+                    self._cond.wait(None if not self._heap else self._heap[0][0] - time.time())
+                if self._closed: return
+                _, _, msg = heapq.heappop(self._heap); self._busy += 1
+            outcome = "sent"
+            try:
+                self._deliver(msg); self.outbox.done(msg["id"])
+            except PermanentPushError:
+                self.outbox.done(msg["id"], "failed"); outcome = "failed"
+            except Exception:
+                msg["attempts"] += 1
+                if msg["attempts"] >= self.max_attempts:
+                    self.outbox.done(msg["id"], "failed"); outcome = "failed"
+                else:
+                    delay = min(BACKOFF_MAX, self.backoff_base * 2 ** (msg["attempts"] - 1))
+                    msg["next_at"] = time.time() + delay * random.uniform(0.8, 1.2)
+                    outcome = "retried"
+            with self._cond:
+                if outcome == "retried": self._push(msg)
+                self.stats[outcome] += 1; self._busy -= 1; self._cond.notify_all()
+
+    def pending(self): return len(self.outbox.pending)
+
+    def flush(self, timeout=None):
+        """等队列发完 (含重试)；超时返回 False"""
+        deadline = None if timeout is None else time.time() + timeout
+        with self._cond:
+            while self._heap or self._busy:
+                left = None if deadline is None else deadline - time.time()
+                if left is not None and left <= 0: return False
+                self._cond.wait(0.1 if left is None else min(left, 0.1))
+        return True
+
+    def close(self):
+        with self._cond: self._closed = True; self._cond.notify_all()
+        for t in self._threads: t.join(1)
+        self.session.close(); self.outbox.close()